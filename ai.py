@@ -1,42 +1,77 @@
-import math
+import os
+import json
 from typing import List, Tuple, Optional
 from station import Station
 
 last_attacks = []
 MAX_AI_MEMORY = 3
 
+WEIGHTS_FILE = "ai_weights.json"
+SEARCH_VERSION = 2  # Bump when minimax changes so cached decisions are not reused
+
+# Coefficients of evaluate_station. tuning.py searches over these and
+# writes the best set to WEIGHTS_FILE, which is loaded at import.
+DEFAULT_WEIGHTS = {
+    'player_population': 5.0,
+    'player_population_scale': 800,
+    'player_aliens': 3.0,
+    'player_damage': 1.5,
+    'player_military': 0.3,
+    'player_distance': 2.0,
+    'player_recent': 30,
+    'alien_population': 5.0,
+    'alien_population_scale': 600,
+    'alien_military': 2.5,
+    'alien_aliens': 2.0,
+    'alien_damage': 0.8,
+    'alien_distance': 1.5,
+    'alien_recent': 20,
+    'distance_scale': 1500,
+}
+
+weights = dict(DEFAULT_WEIGHTS)
+
+def load_weights(path: str = WEIGHTS_FILE) -> dict:
+    """Replace the active weights with DEFAULT_WEIGHTS overlaid by the file, if present"""
+    weights.clear()
+    weights.update(DEFAULT_WEIGHTS)
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+        weights.update({k: float(v) for k, v in stored.items() if k in DEFAULT_WEIGHTS})
+    return weights
+
+load_weights()
+
+def weights_signature() -> str:
+    """Fingerprint of the search version and active weights, used to namespace cached decisions"""
+    return json.dumps([SEARCH_VERSION, sorted(weights.items())])
+
 def evaluate_station(station: Station, is_player: bool, base_station, memory_attacks=None) -> int:
     global last_attacks
 
     recent_attacks = memory_attacks if memory_attacks is not None else last_attacks
 
-    if not hasattr(station, 'distance_from_base') or station.distance_from_base == 0:
-        dx = station.pos[0] - base_station.pos[0]
-        dy = station.pos[1] - base_station.pos[1]
-        distance = math.sqrt(dx * dx + dy * dy)
-        distance_penalty = distance / 1500
-    else:
-        distance_penalty = station.distance_from_base / 1500
-
-    distance_penalty = min(max(distance_penalty, 0), 1)
+    w = weights
+    distance_penalty = min(max(station.distance_from_base / w['distance_scale'], 0), 1)
 
     if is_player:
         raw_score = (
-            (station.population / 800) * 5.0 +
-            (station.alien_count * 3.0) +
-            (station.damage * 1.5) -
-            (station.military_population * 0.3) -
-            (distance_penalty * 2.0) -
-            (30 if station in recent_attacks else 0)
+            (station.population / w['player_population_scale']) * w['player_population'] +
+            (station.alien_count * w['player_aliens']) +
+            (station.damage * w['player_damage']) -
+            (station.military_population * w['player_military']) -
+            (distance_penalty * w['player_distance']) -
+            (w['player_recent'] if station in recent_attacks else 0)
         )
     else:
         raw_score = (
-            (station.population / 600) * 5.0 -
-            (station.military_population * 2.5) +
-            (station.alien_count * 2.0) -
-            (station.damage * 0.8) -
-            (distance_penalty * 1.5) +
-            (20 if station in recent_attacks else 0)
+            (station.population / w['alien_population_scale']) * w['alien_population'] -
+            (station.military_population * w['alien_military']) +
+            (station.alien_count * w['alien_aliens']) -
+            (station.damage * w['alien_damage']) -
+            (distance_penalty * w['alien_distance']) +
+            (w['alien_recent'] if station in recent_attacks else 0)
         )
 
     priority_score = max(1, round(raw_score))
@@ -53,7 +88,7 @@ def minimax(stations: List[Station], depth: int, is_maximizing: bool,
     
     if depth == 0 or is_terminal_state(stations):
         return evaluate_terminal(stations, is_maximizing, base_station, recent_attacks)
-        
+
     best_station = None
     
     best_value = float('-inf') if is_maximizing else float('inf')
@@ -95,6 +130,21 @@ def minimax(stations: List[Station], depth: int, is_maximizing: bool,
             
     return best_station, best_value
 
+def cached_minimax(stations: List[Station], depth: int, is_maximizing: bool,
+                   base_station, memory_attacks=None, cache=None) -> Tuple[Optional[Station], float]:
+    """minimax from the root, consulting a DecisionCache first when one is given"""
+    if cache is not None:
+        hit = cache.lookup(stations, depth, is_maximizing, memory_attacks)
+        if hit is not None:
+            return hit
+
+    result = minimax(stations, depth, is_maximizing, float('-inf'), float('inf'),
+                     base_station, memory_attacks)
+
+    if cache is not None:
+        cache.store(stations, depth, is_maximizing, memory_attacks, *result)
+    return result
+
 def is_terminal_state(stations: List[Station]) -> bool:
     return (all(s.population <= 0 for s in stations) or
             all(s.alien_count <= 0 for s in stations))
@@ -143,14 +193,13 @@ def undo_simulation(station: Station, original_state: dict):
     station.population = original_state['population']
     station.damage = original_state['damage']
 
-def get_ai_decision(stations: List[Station], base_station, is_player_turn: bool) -> Station:
+def get_ai_decision(stations: List[Station], base_station, is_player_turn: bool, cache=None) -> Station:
     global last_attacks
     
     depth = min(4, max(2, len(stations) // 2))
     
-    best_station, _ = minimax(
-        stations, depth, not is_player_turn, 
-        float('-inf'), float('inf'), base_station, last_attacks
+    best_station, _ = cached_minimax(
+        stations, depth, not is_player_turn, base_station, last_attacks, cache
     )
     
     if not is_player_turn and best_station:
@@ -0,0 +1,125 @@
+import os
+import time
+import pygame
+from typing import Dict, Tuple, Optional
+
+ASSET_DIR = "assets"
+CACHE_DIR = ".asset_cache"
+
+
+class AssetManager:
+    """Loads sprites on first use and keeps scaled, converted copies in memory.
+
+    Nothing is decoded until a key is first drawn, and each (key, zoom)
+    pair is scaled once per run. Sprites shrunk from a larger source are
+    also kept on disk as raw RGBA dumps named after the source file, its
+    mtime and the target size, so editing a PNG or changing a size
+    invalidates them. Upscaled sprites are not cached: their dump would be
+    bigger than the PNG and no quicker to read than decoding it.
+    """
+
+    def __init__(self, asset_dir: str = ASSET_DIR, cache_dir: Optional[str] = CACHE_DIR):
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir
+        self.specs: Dict[str, Tuple[str, Tuple[int, int], bool]] = {}
+        self.surfaces: Dict[str, pygame.Surface] = {}
+        self.scaled: Dict[Tuple[str, float], pygame.Surface] = {}
+        self.fonts: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+        self.load_times: Dict[str, Tuple[float, str]] = {}
+
+    def register(self, key: str, filename: str, size: Tuple[int, int], alpha: bool = True):
+        self.specs[key] = (filename, (int(size[0]), int(size[1])), alpha)
+
+    def get(self, key: str) -> pygame.Surface:
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self._load(key)
+            self.surfaces[key] = surface
+        return surface
+
+    def get_scaled(self, key: str, scale: float) -> pygame.Surface:
+        """Registered sprite resized by scale; kept in memory per scale factor"""
+        if scale == 1.0:
+            return self.get(key)
+        surface = self.scaled.get((key, scale))
+        if surface is None:
+            base = self.get(key)
+            size = (max(1, int(base.get_width() * scale)), max(1, int(base.get_height() * scale)))
+            surface = pygame.transform.smoothscale(base, size)
+            self.scaled[(key, scale)] = surface
+        return surface
+
+    def font(self, name: str, size: int, bold: bool = False) -> pygame.font.Font:
+        font_key = (name, size, bold)
+        font = self.fonts.get(font_key)
+        if font is None:
+            start = time.perf_counter()
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[font_key] = font
+            self.load_times[f"font:{name}:{size}"] = (time.perf_counter() - start, "font")
+        return font
+
+    def preload(self):
+        for key in self.specs:
+            self.get(key)
+
+    def startup_report(self) -> str:
+        lines = []
+        for key, (seconds, source) in self.load_times.items():
+            lines.append(f"{key:<24} {seconds * 1000:7.2f} ms  ({source})")
+        total = sum(seconds for seconds, _ in self.load_times.values())
+        lines.append(f"{'total':<24} {total * 1000:7.2f} ms")
+        return "\n".join(lines)
+
+    def _load(self, key: str) -> pygame.Surface:
+        filename, size, alpha = self.specs[key]
+        path = os.path.join(self.asset_dir, filename)
+        start = time.perf_counter()
+
+        cache_path = self._cache_path(filename, size, os.stat(path).st_mtime_ns)
+        surface = self._read_cache(cache_path, size)
+        source = "cache"
+        if surface is None:
+            image = pygame.image.load(path)
+            surface = pygame.transform.scale(image, size)
+            if size[0] * size[1] < image.get_width() * image.get_height():
+                self._write_cache(cache_path, surface)
+            source = "disk"
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+
+        self.load_times[key] = (time.perf_counter() - start, source)
+        return surface
+
+    def _cache_path(self, filename: str, size: Tuple[int, int], mtime_ns: int) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(self.cache_dir, f"{stem}_{size[0]}x{size[1]}_{mtime_ns}.rgba")
+
+    def _read_cache(self, cache_path: Optional[str], size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        if cache_path is None or not os.path.exists(cache_path):
+            return None
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        if len(data) != size[0] * size[1] * 4:
+            return None
+        return pygame.image.frombytes(data, size, "RGBA")
+
+    def _write_cache(self, cache_path: Optional[str], surface: pygame.Surface):
+        if cache_path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Drop entries for the same source/size left behind by an older mtime
+            prefix = os.path.basename(cache_path).rsplit("_", 1)[0] + "_"
+            for entry in os.listdir(self.cache_dir):
+                if entry.startswith(prefix):
+                    os.remove(os.path.join(self.cache_dir, entry))
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
@@ -0,0 +1,98 @@
+import numpy as np
+from typing import List, Optional, Tuple
+from station import Station
+from game_logic import player_defend
+
+MAP_SIZE = (1200, 700)  # The default map fills main.py's window
+BASE_OFFSET = (215, 20)  # Earth sits this far in from the map's top-right corner
+
+
+def default_base_pos(map_width: int = MAP_SIZE[0]) -> Tuple[int, int]:
+    """Top-left of the Earth base sprite on a map of the given width"""
+    return (map_width - BASE_OFFSET[0], BASE_OFFSET[1])
+
+
+class ResourceBase:
+    WIDTH = 200
+    HEIGHT = 200
+
+    __slots__ = ('name', 'pos', 'troops', 'center')
+
+    def __init__(self, name, pos, troops):
+        self.name = name
+        self.pos = pos
+        self.troops = troops
+        self.center = (pos[0] + ResourceBase.WIDTH // 2, pos[1] + ResourceBase.HEIGHT // 2)
+
+
+def station_positions(stations) -> np.ndarray:
+    """(S, 2) array of station positions, read from scenario columns when available"""
+    columns = getattr(stations, 'columns', None)
+    if columns is not None:
+        return np.asarray(columns['pos'], dtype=np.float64)
+    return np.array([s.pos for s in stations], dtype=np.float64).reshape(-1, 2)
+
+
+class BaseNetwork:
+    """Resource bases plus a precomputed station x base distance matrix.
+
+    Stations are looked up by their ``index``, so distance and nearest-base
+    queries are plain array reads.
+    """
+
+    def __init__(self, bases: List[ResourceBase], positions: np.ndarray):
+        if not bases:
+            raise ValueError("BaseNetwork needs at least one base")
+        self.bases = list(bases)
+        self.base_rows = {base: i for i, base in enumerate(self.bases)}
+
+        base_pos = np.array([b.pos for b in self.bases], dtype=np.float64)
+        delta = positions[:, None, :] - base_pos[None, :, :]
+        self.distances = np.hypot(delta[..., 0], delta[..., 1])
+        self.base_order = np.argsort(self.distances, axis=1, kind='stable')
+        self.nearest = self.base_order[:, 0]
+        self.nearest_distance = self.distances[np.arange(len(self.nearest)), self.nearest]
+
+    def attach(self, station: Station):
+        """Point the station's cached base geometry at its nearest base"""
+        b = int(self.nearest[station.index])
+        station.set_base(self.bases[b].pos, float(self.distances[station.index, b]))
+
+    def attach_all(self, stations):
+        for station in stations:
+            self.attach(station)
+
+    def base_index(self, base: ResourceBase) -> int:
+        return self.base_rows[base]
+
+    def distance(self, station: Station, base: ResourceBase) -> float:
+        return float(self.distances[station.index, self.base_index(base)])
+
+    def nearest_base(self, station: Station) -> ResourceBase:
+        return self.bases[int(self.nearest[station.index])]
+
+    def supplying_base(self, station: Station, reinforcements: int) -> Optional[ResourceBase]:
+        """Closest base that can afford the reinforcements, if any"""
+        for b in self.base_order[station.index]:
+            if self.bases[b].troops >= reinforcements:
+                return self.bases[b]
+        return None
+
+    def total_troops(self) -> int:
+        return sum(b.troops for b in self.bases)
+
+    def defend(self, station: Station, reinforcements: int, base: Optional[ResourceBase] = None) -> Optional[ResourceBase]:
+        """Send troops from the chosen base (or the nearest one that can afford them).
+
+        Returns the base that paid for the defense, or None if nothing was sent.
+        """
+        if base is None:
+            base = self.supplying_base(station, reinforcements)
+        if base is None or base.troops < reinforcements:
+            return None
+
+        if not player_defend(station, reinforcements, base, self.distance(station, base)):
+            return None
+
+        base.troops -= reinforcements
+        return base
@@ -0,0 +1,386 @@
+import sys
+import argparse
+import random
+import numpy as np
+from typing import Dict, Optional
+from station import Station, update_damage
+from bases import MAP_SIZE, ResourceBase, default_base_pos
+from game_logic import (
+    MILITARY_STRENGTH, CIVILIAN_STRENGTH, DISTANCE_PENALTY,
+    MAX_POPULATION, MIN_POPULATION, MAX_MILITARY, MAX_ALIENS,
+    alien_attack, player_defend, minor_alien_attack
+)
+import ai
+from ai import MAX_AI_MEMORY
+
+DEFAULT_REINFORCEMENTS = 50
+DEFAULT_MAX_TURNS = 20  # Every opening stalls by turn 10; see check_game_over
+BASE_TROOPS = 500
+MAX_GAP = 4.0  # Standard errors between batch and scalar means before --check fails
+
+
+def calculate_combat_strength(attackers, defenders, has_military=True):
+    """Array version of game_logic.calculate_combat_strength"""
+    strength = MILITARY_STRENGTH if has_military else CIVILIAN_STRENGTH
+    ratio = (defenders * strength) / (attackers + 1)
+    return 1 - np.exp(-ratio)
+
+
+class BatchState:
+    """G independent games x S stations held as (G, S) integer arrays."""
+
+    def __init__(self, population, military, aliens, distance, base_troops, original_population=None):
+        self.population = np.array(population, dtype=np.int64)
+        self.military = np.array(military, dtype=np.int64)
+        self.aliens = np.array(aliens, dtype=np.int64)
+        self.original_population = (self.population.copy() if original_population is None
+                                    else np.array(original_population, dtype=np.int64))
+        self.distance = np.broadcast_to(np.asarray(distance, dtype=np.float64), self.population.shape).copy()
+        self.damage = np.zeros_like(self.population)
+
+        games = self.population.shape[0]
+        self.base_troops = np.broadcast_to(np.asarray(base_troops, dtype=np.int64), (games,)).copy()
+        self.turn = np.zeros(games, dtype=np.int64)
+        self.finished = np.zeros(games, dtype=bool)
+        self.human_won = np.zeros(games, dtype=bool)
+        # Last MAX_AI_MEMORY alien targets per game, -1 for empty slots
+        self.recent = np.full((games, MAX_AI_MEMORY), -1, dtype=np.int64)
+        update_damage(self, np.ones(self.population.shape, dtype=bool))
+
+    @property
+    def games(self) -> int:
+        return self.population.shape[0]
+
+    @property
+    def stations(self) -> int:
+        return self.population.shape[1]
+
+    @classmethod
+    def random(cls, games: int, stations: int, rng: np.random.Generator, base_troops: int = BASE_TROOPS,
+               alien_scale: float = 1.0):
+        """Openings drawn from the same ranges as main.py, with alien counts multiplied by alien_scale"""
+        shape = (games, stations)
+        population = rng.integers(200, 501, size=shape)
+        military = np.where(rng.random(shape) < 0.7,
+                            rng.integers(10, 51, size=shape),
+                            rng.integers(0, 11, size=shape))
+        aliens = np.where(rng.random(shape) < 0.7,
+                          rng.integers(50, 71, size=shape),
+                          rng.integers(0, 6, size=shape))
+        aliens = np.minimum(MAX_ALIENS, (aliens * alien_scale).astype(np.int64))
+        width, height = MAP_SIZE
+        base_x, base_y = default_base_pos(width)
+        x = rng.integers(100, width - 199, size=shape)
+        y = rng.integers(50, height - 199, size=shape)
+        distance = np.hypot(x - base_x, y - base_y)
+        return cls(population, military, aliens, distance, base_troops)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], games: int, distance, base_troops: int = BASE_TROOPS):
+        """Tile one scenario (see scenario.py) across G games"""
+        def tile(column):
+            return np.tile(np.asarray(columns[column]), (games, 1))
+        return cls(tile('population'), tile('military'), tile('aliens'), distance, base_troops,
+                   original_population=tile('original_population'))
+
+
+def _uniform(rng, low, high, size):
+    return low + (high - low) * rng.random(size)
+
+
+def minor_alien_attack_batch(state, rng: np.random.Generator, active=None) -> np.ndarray:
+    """Apply game_logic.minor_alien_attack to every station holding humans and aliens.
+
+    Works on any state with population / aliens / original_population /
+    damage arrays. active must broadcast against them (use active[:, None]
+    for a per-game mask). Returns the mask of stations that were hit.
+    """
+    hit = (state.population > 0) & (state.aliens > 0)
+    if active is not None:
+        hit &= active
+
+    shape = state.population.shape
+    lost = np.floor(_uniform(rng, 0.1, 0.15, shape) * state.population).astype(np.int64)
+    state.population = np.where(hit, state.population - lost, state.population)
+    update_damage(state, hit)
+
+    light = rng.integers(1, 4, size=shape)
+    state.population = np.where(hit, np.maximum(0, state.population - light), state.population)
+    state.original_population = np.where(hit, state.population, state.original_population)
+    return hit
+
+
+def alien_attack_batch(state: BatchState, targets, rng: np.random.Generator, active=None) -> np.ndarray:
+    """Apply game_logic.alien_attack to one target station per game.
+
+    targets is a (G,) index array; -1 or a station without aliens means no
+    attack. Returns the (G,) mask of games where an attack happened.
+    """
+    games = np.arange(state.games)
+    target = np.maximum(targets, 0)
+    aliens = state.aliens[games, target]
+    military = state.military[games, target]
+    civilians = state.population[games, target]
+
+    attacked = (targets >= 0) & (aliens > 0)
+    if active is not None:
+        attacked &= active
+
+    size = state.games
+    roll = rng.random(size)
+    has_military = military > 0
+
+    # Military defends
+    mil_win = roll < calculate_combat_strength(aliens, military)
+    mil_new_military = np.where(mil_win, np.floor(military * _uniform(rng, 0.6, 0.8, size)), 0)
+    mil_new_aliens = np.where(mil_win, 0, np.floor(aliens * _uniform(rng, 0.5, 0.7, size)))
+    mil_new_population = np.where(mil_win,
+                                  np.floor(civilians * _uniform(rng, 0.85, 0.95, size)),
+                                  np.floor(civilians * _uniform(rng, 0.4, 0.6, size)))
+
+    # Civilians resist on their own
+    civ_win = roll < calculate_combat_strength(aliens, civilians, False) * 0.3
+    civ_new_aliens = np.where(civ_win, 0, aliens)
+    civ_new_population = np.where(civ_win, np.floor(civilians * _uniform(rng, 0.2, 0.4, size)), 0)
+
+    new_military = np.where(has_military, mil_new_military, military)
+    new_aliens = np.where(has_military, mil_new_aliens, civ_new_aliens)
+    new_population = np.where(has_military, mil_new_population, civ_new_population)
+
+    _write_back(state, games, target, attacked,
+                np.maximum(0, new_population), np.maximum(0, new_military), np.maximum(0, new_aliens))
+    return attacked
+
+
+def player_defend_batch(state: BatchState, targets, reinforcements, rng: np.random.Generator, active=None) -> np.ndarray:
+    """Apply game_logic.player_defend to one target station per game.
+
+    Reinforcements are deducted from base_troops wherever the defense went
+    ahead. Returns the (G,) mask of games where troops were sent.
+    """
+    games = np.arange(state.games)
+    target = np.maximum(targets, 0)
+    reinforcements = np.broadcast_to(np.asarray(reinforcements, dtype=np.int64), (state.games,))
+    aliens = state.aliens[games, target]
+    military = state.military[games, target]
+    population = state.population[games, target]
+    distance = state.distance[games, target]
+
+    defended = (targets >= 0) & (reinforcements > 0) & (aliens > 0)
+    if active is not None:
+        defended &= active
+
+    size = state.games
+    distance_factor = np.maximum(0.4, 1 - (distance / DISTANCE_PENALTY))
+    effective = np.minimum(MAX_MILITARY, np.floor(reinforcements * distance_factor))
+    total_military = np.minimum(MAX_MILITARY, military + effective)
+
+    win = rng.random(size) < calculate_combat_strength(aliens, total_military) * 1.1
+
+    new_aliens = np.where(win, 0,
+                          np.clip(np.floor(aliens * _uniform(rng, 0.3, 0.5, size)), 0, MAX_ALIENS))
+    new_military = np.where(win,
+                            np.floor(total_military * _uniform(rng, 0.7, 0.9, size)),
+                            np.floor(total_military * _uniform(rng, 0.5, 0.7, size)))
+    new_population = np.where(win,
+                              np.floor(population * _uniform(rng, 1.05, 1.15, size)),
+                              np.floor(population * _uniform(rng, 0.8, 0.9, size)))
+
+    _write_back(state, games, target, defended,
+                np.clip(new_population, MIN_POPULATION, MAX_POPULATION),
+                np.clip(new_military, 0, MAX_MILITARY),
+                new_aliens)
+    state.base_troops = np.where(defended, state.base_troops - reinforcements, state.base_troops)
+    return defended
+
+
+def _write_back(state, games, target, mask, population, military, aliens):
+    rows, cols = games[mask], target[mask]
+    state.population[rows, cols] = population[mask]
+    state.military[rows, cols] = military[mask]
+    state.aliens[rows, cols] = aliens[mask]
+
+    touched = np.zeros(state.population.shape, dtype=bool)
+    touched[rows, cols] = True
+    update_damage(state, touched)
+
+
+def station_scores(state: BatchState, is_player: bool, weights: Optional[dict] = None) -> np.ndarray:
+    """ai.evaluate_station for every station of every game, as a (G, S) array.
+
+    Also scores a single board: with (S,) station arrays and an (M,) recent
+    index array the result is (S,).
+    """
+    w = ai.weights if weights is None else weights
+    distance_penalty = np.clip(state.distance / w['distance_scale'], 0, 1)
+    stations = np.arange(state.population.shape[-1])
+    recent = (state.recent[..., :, None] == stations).any(axis=-2)
+
+    if is_player:
+        raw = ((state.population / w['player_population_scale']) * w['player_population'] +
+               (state.aliens * w['player_aliens']) +
+               (state.damage * w['player_damage']) -
+               (state.military * w['player_military']) -
+               (distance_penalty * w['player_distance']) -
+               np.where(recent, w['player_recent'], 0))
+    else:
+        raw = ((state.population / w['alien_population_scale']) * w['alien_population'] -
+               (state.military * w['alien_military']) +
+               (state.aliens * w['alien_aliens']) -
+               (state.damage * w['alien_damage']) -
+               (distance_penalty * w['alien_distance']) +
+               np.where(recent, w['alien_recent'], 0))
+
+    return np.maximum(1, np.round(raw))
+
+
+def pick_targets(state: BatchState, is_player: bool, weights: Optional[dict] = None) -> np.ndarray:
+    """Greedy one-ply policy: best-scoring station holding both humans and aliens, or -1"""
+    valid = (state.population > 0) & (state.aliens > 0)
+    scores = np.where(valid, station_scores(state, is_player, weights), -np.inf)
+    targets = np.argmax(scores, axis=1)
+    return np.where(valid.any(axis=1), targets, -1)
+
+
+def check_game_over(state: BatchState, max_turns: int):
+    """Vectorized GameSession.check_game_over, with a turn limit in place of the clock.
+
+    Once no station holds both humans and aliens neither policy has a move
+    left, so the board can only wait for the clock; such games are scored by
+    the timer rule straight away instead of idling to max_turns.
+    """
+    running = ~state.finished
+    humans = state.population.sum(axis=1)
+    aliens = state.aliens.sum(axis=1)
+
+    humans_dead = (state.population <= 0).all(axis=1)
+    aliens_dead = (state.aliens <= 0).all(axis=1)
+    no_troops = (state.base_troops <= 0) & (state.military <= 0).all(axis=1)
+    stalled = ~((state.population > 0) & (state.aliens > 0)).any(axis=1)
+    timed_out = (state.turn >= max_turns) | stalled
+
+    lost = humans_dead | (~aliens_dead & no_troops)
+    won = ~humans_dead & aliens_dead
+    timeout_won = (humans > aliens * 3) | (aliens == 0)
+
+    done = running & (lost | won | timed_out)
+    state.human_won = np.where(done, np.where(lost, False, np.where(won, True, timeout_won)), state.human_won)
+    state.finished |= done
+
+
+class BatchSimulator:
+    """Advances every unfinished game by one alien turn and one player turn per step."""
+
+    def __init__(self, state: BatchState, seed: Optional[int] = None,
+                 reinforcements: int = DEFAULT_REINFORCEMENTS, max_turns: int = DEFAULT_MAX_TURNS,
+                 player_weights: Optional[dict] = None, alien_weights: Optional[dict] = None):
+        self.state = state
+        self.rng = np.random.default_rng(seed)
+        self.reinforcements = reinforcements
+        self.max_turns = max_turns
+        self.player_weights = player_weights
+        self.alien_weights = alien_weights
+
+    def step(self):
+        state = self.state
+        active = ~state.finished
+
+        # A game's first alien turn is main.py's opening wave: a light hit on
+        # every contested station, remembered in station order
+        opening = active & (state.turn == 0)
+        if opening.any():
+            hit = minor_alien_attack_batch(state, self.rng, opening[:, None])
+            order = np.sort(np.where(hit, np.arange(state.stations), -1), axis=1)
+            latest = np.concatenate([state.recent, order], axis=1)[:, -MAX_AI_MEMORY:]
+            state.recent = np.where(opening[:, None], latest, state.recent)
+
+        attacking = active & ~opening
+        targets = pick_targets(state, is_player=False, weights=self.alien_weights)
+        attacked = alien_attack_batch(state, targets, self.rng, attacking)
+        state.recent = np.where(attacked[:, None],
+                                np.concatenate([state.recent[:, 1:], targets[:, None]], axis=1),
+                                state.recent)
+
+        targets = pick_targets(state, is_player=True, weights=self.player_weights)
+        troops = np.minimum(self.reinforcements, state.base_troops)
+        player_defend_batch(state, targets, troops, self.rng, active)
+
+        state.turn += active
+        check_game_over(state, self.max_turns)
+
+    def run(self) -> BatchState:
+        check_game_over(self.state, self.max_turns)
+        while not self.state.finished.all():
+            self.step()
+        return self.state
+
+
+def consistency_check(trials: int = 20000, seed: int = 0) -> Dict[str, float]:
+    """Compare outcomes of the batch combat functions against game_logic.
+
+    Every trial starts from the same station, so scalar and batch means of
+    population, military, aliens and damage should only differ by sampling
+    noise. Returns, per function, the largest gap between means measured in
+    standard errors; anything above MAX_GAP points at a rule mismatch.
+    """
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    base = ResourceBase("Earth", default_base_pos(), BASE_TROOPS)
+    openings = [(300, 30, 60, 400.0), (300, 0, 60, 400.0), (450, 5, 3, 900.0), (250, 60, 20, 1500.0)]
+    gaps = {}
+
+    for name in ('minor_alien_attack', 'alien_attack', 'player_defend'):
+        worst = 0.0
+        for population, military, aliens, distance in openings:
+            scalar = np.zeros((trials, 4))
+            for i in range(trials):
+                station = Station("S", (0, 0), population, military, aliens, base.pos)
+                station.set_base(base.pos, distance)
+                if name == 'minor_alien_attack':
+                    minor_alien_attack(station)
+                elif name == 'alien_attack':
+                    alien_attack(station)
+                else:
+                    player_defend(station, DEFAULT_REINFORCEMENTS, base)
+                scalar[i] = (station.population, station.military_population, station.alien_count, station.damage)
+
+            state = BatchState(np.full((trials, 1), population), np.full((trials, 1), military),
+                               np.full((trials, 1), aliens), distance, BASE_TROOPS)
+            targets = np.zeros(trials, dtype=np.int64)
+            if name == 'minor_alien_attack':
+                minor_alien_attack_batch(state, rng)
+            elif name == 'alien_attack':
+                alien_attack_batch(state, targets, rng)
+            else:
+                player_defend_batch(state, targets, DEFAULT_REINFORCEMENTS, rng)
+            batch = np.stack([state.population[:, 0], state.military[:, 0],
+                              state.aliens[:, 0], state.damage[:, 0]], axis=1)
+
+            std_error = np.sqrt((scalar.var(axis=0) + batch.var(axis=0)) / trials)
+            diff = np.abs(batch.mean(axis=0) - scalar.mean(axis=0))
+            z = np.where(std_error > 0, diff / np.where(std_error > 0, std_error, 1), np.where(diff > 0, np.inf, 0))
+            worst = max(worst, float(z.max()))
+        gaps[name] = worst
+    return gaps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many headless games in lockstep")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="compare against game_logic and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        gaps = consistency_check(seed=args.seed)
+        for fn, gap in gaps.items():
+            print(f"{fn}: largest gap {gap:.2f} standard errors")
+        failed = [fn for fn, gap in gaps.items() if gap > MAX_GAP]
+        if failed:
+            sys.exit(f"Consistency check failed for {', '.join(failed)} (limit {MAX_GAP} standard errors)")
+    else:
+        sim = BatchSimulator(BatchState.random(args.games, args.stations, np.random.default_rng(args.seed)), args.seed)
+        final = sim.run()
+        print(f"{args.games} games, human win rate {final.human_won.mean():.3f}, "
+              f"mean turns {final.turn.mean():.1f}")
@@ -0,0 +1,104 @@
+import pygame
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from station import Station
+
+ZOOM_LEVELS = [0.25, 0.375, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0]
+
+
+class Camera:
+    """Maps world coordinates to the window, with panning and stepped zoom.
+
+    Zoom snaps to ZOOM_LEVELS so scaled sprites can be cached per level.
+    """
+
+    def __init__(self, view_size: Tuple[int, int], world_size: Tuple[int, int]):
+        self.view_size = view_size
+        self.world_size = world_size
+        self.offset = [0.0, 0.0]
+        self.zoom_index = ZOOM_LEVELS.index(1.0)
+
+    @property
+    def zoom(self) -> float:
+        return ZOOM_LEVELS[self.zoom_index]
+
+    def world_to_screen(self, pos) -> Tuple[int, int]:
+        return (int((pos[0] - self.offset[0]) * self.zoom),
+                int((pos[1] - self.offset[1]) * self.zoom))
+
+    def screen_to_world(self, pos) -> Tuple[float, float]:
+        return (pos[0] / self.zoom + self.offset[0],
+                pos[1] / self.zoom + self.offset[1])
+
+    def scale(self, length) -> int:
+        return max(1, int(length * self.zoom))
+
+    def visible_rect(self) -> pygame.Rect:
+        return pygame.Rect(int(self.offset[0]), int(self.offset[1]),
+                           int(self.view_size[0] / self.zoom) + 1,
+                           int(self.view_size[1] / self.zoom) + 1)
+
+    def pan(self, dx: float, dy: float):
+        """Move the view by a distance given in screen pixels"""
+        self.offset[0] += dx / self.zoom
+        self.offset[1] += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, steps: int, screen_pos):
+        """Zoom in (steps > 0) or out, keeping the point under screen_pos fixed"""
+        anchor = self.screen_to_world(screen_pos)
+        self.zoom_index = min(len(ZOOM_LEVELS) - 1, max(0, self.zoom_index + steps))
+        self.offset[0] = anchor[0] - screen_pos[0] / self.zoom
+        self.offset[1] = anchor[1] - screen_pos[1] / self.zoom
+        self.clamp()
+
+    def clamp(self):
+        for axis in (0, 1):
+            span = self.view_size[axis] / self.zoom
+            max_offset = self.world_size[axis] - span
+            if max_offset <= 0:
+                # World fits in the window on this axis: keep it centred
+                self.offset[axis] = max_offset / 2
+            else:
+                self.offset[axis] = min(max(self.offset[axis], 0), max_offset)
+
+
+class SpatialGrid:
+    """Uniform grid over station positions for viewport and click queries.
+
+    Stations never move, so the grid is built once from the (S, 2) array of
+    positions and only ever returns station indices.
+    """
+
+    def __init__(self, positions: np.ndarray, cell_size: int = 400):
+        self.cell_size = cell_size
+        self.positions = np.asarray(positions)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+        cell_coords = (self.positions // cell_size).astype(np.int64)
+        for index, (cx, cy) in enumerate(cell_coords.tolist()):
+            self.cells.setdefault((cx, cy), []).append(index)
+
+    def query(self, rect: pygame.Rect) -> List[int]:
+        """Indices of stations whose sprite intersects rect"""
+        size = self.cell_size
+        # Stations are keyed by their top-left corner, so widen the search
+        # up and left by one sprite to catch ones overlapping the edge
+        x0 = int((rect.left - Station.WIDTH) // size)
+        y0 = int((rect.top - Station.HEIGHT) // size)
+        x1 = int(rect.right // size)
+        y1 = int(rect.bottom // size)
+
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for index in self.cells.get((cx, cy), ()):
+                    x, y = self.positions[index]
+                    if (x < rect.right and x + Station.WIDTH > rect.left and
+                            y < rect.bottom and y + Station.HEIGHT > rect.top):
+                        found.append(index)
+        return found
+
+    def at_point(self, pos) -> Optional[int]:
+        hits = self.query(pygame.Rect(int(pos[0]), int(pos[1]), 1, 1))
+        return hits[0] if hits else None
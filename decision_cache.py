@@ -0,0 +1,179 @@
+import time
+import sqlite3
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from station import Station
+
+CACHE_FILE = "ai_cache.sqlite"
+MAX_ENTRIES = 100000
+PRELOAD_ENTRIES = 5000
+TOUCH_BATCH = 64
+
+# Bucket sizes for the canonical state. Positions whose stations fall in the
+# same buckets share a cached decision.
+POPULATION_QUANTUM = 10
+MILITARY_QUANTUM = 5
+ALIEN_QUANTUM = 5
+DAMAGE_QUANTUM = 10
+DISTANCE_QUANTUM = 100
+
+
+def station_features(station: Station, recent: bool) -> Tuple[int, ...]:
+    return (
+        station.population // POPULATION_QUANTUM + (station.population > 0),
+        station.military_population // MILITARY_QUANTUM,
+        station.alien_count // ALIEN_QUANTUM + (station.alien_count > 0),
+        station.damage // DAMAGE_QUANTUM,
+        int(station.distance_from_base // DISTANCE_QUANTUM),
+        recent,
+    )
+
+
+def canonical_state(stations: List[Station], depth: int, is_maximizing: bool,
+                    memory_attacks=None, namespace: str = "") -> Tuple[bytes, List[int]]:
+    """Hash of the quantized position, independent of station order.
+
+    Returns (key, order) where order[i] is the index in ``stations`` of the
+    i-th station in canonical order, used to map cached choices back.
+    """
+    recent = memory_attacks or []
+    features = [station_features(s, s in recent) for s in stations]
+    order = sorted(range(len(stations)), key=features.__getitem__)
+    payload = repr((namespace, depth, is_maximizing, [features[i] for i in order]))
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest(), order
+
+
+class DecisionCache:
+    """Size-bounded SQLite store of search results shared across processes.
+
+    The database runs in WAL mode so any number of readers can open it
+    while one process writes. Recently used rows are preloaded into memory;
+    hits only update ``last_used`` in batches, and once the table grows past
+    max_entries the least recently used rows are evicted. Every operation is
+    best effort: if the database is busy the cache just misses, and if the
+    file cannot be opened at all it falls back to a private in-memory
+    database for this process.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = MAX_ENTRIES,
+                 namespace: str = "", preload: int = PRELOAD_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.local: Dict[bytes, Tuple[int, float]] = {}
+        self.touched: Dict[bytes, float] = {}
+        self.inserts = 0
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            self.conn = self._open(path)
+            if preload:
+                self.preload(preload)
+        except sqlite3.Error:
+            self.path = ":memory:"
+            self.conn = self._open(self.path)
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=2.0)
+        try:
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                " key BLOB PRIMARY KEY, choice INTEGER NOT NULL, value REAL NOT NULL,"
+                " hits INTEGER NOT NULL DEFAULT 0, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS decisions_last_used ON decisions (last_used)")
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def preload(self, limit: int):
+        rows = self.conn.execute(
+            "SELECT key, choice, value FROM decisions ORDER BY last_used DESC LIMIT ?", (limit,)
+        )
+        for key, choice, value in rows:
+            self.local[key] = (choice, value)
+
+    def lookup(self, stations: List[Station], depth: int, is_maximizing: bool,
+               memory_attacks=None) -> Optional[Tuple[Optional[Station], float]]:
+        key, order = canonical_state(stations, depth, is_maximizing, memory_attacks, self.namespace)
+        entry = self.local.get(key)
+        if entry is None:
+            try:
+                row = self.conn.execute("SELECT choice, value FROM decisions WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            entry = self.local[key] = (row[0], row[1])
+
+        self.hits += 1
+        self._touch(key)
+        choice, value = entry
+        return (stations[order[choice]] if choice >= 0 else None), value
+
+    def store(self, stations: List[Station], depth: int, is_maximizing: bool, memory_attacks,
+              station: Optional[Station], value: float):
+        key, order = canonical_state(stations, depth, is_maximizing, memory_attacks, self.namespace)
+        choice = -1
+        if station is not None:
+            choice = next(i for i, index in enumerate(order) if stations[index] is station)
+        self.local[key] = (choice, value)
+
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO decisions (key, choice, value, hits, last_used) VALUES (?, ?, ?, 0, ?)",
+                (key, choice, value, time.time())
+            )
+            self.conn.commit()
+        except sqlite3.Error:
+            return
+
+        self.inserts += 1
+        if self.inserts % TOUCH_BATCH == 0:
+            self.evict()
+
+    def _touch(self, key: bytes):
+        self.touched[key] = time.time()
+        if len(self.touched) >= TOUCH_BATCH:
+            self.flush()
+
+    def flush(self):
+        if not self.touched:
+            return
+        try:
+            self.conn.executemany(
+                "UPDATE decisions SET hits = hits + 1, last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self.touched.items()]
+            )
+            self.conn.commit()
+        except sqlite3.Error:
+            return
+        self.touched.clear()
+
+    def evict(self):
+        """Drop least recently used rows beyond max_entries"""
+        try:
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM decisions").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self.conn.execute(
+                    "DELETE FROM decisions WHERE key IN "
+                    "(SELECT key FROM decisions ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self.conn.commit()
+        except sqlite3.Error:
+            pass
+        if len(self.local) > self.max_entries:
+            self.local.clear()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -52,12 +52,12 @@ def alien_attack(station):
     station.update_damage()
     return True
 
-def player_defend(station, reinforcements, base_station):
+def player_defend(station, reinforcements, base_station, distance=None):
     if reinforcements <= 0 or station.alien_count <= 0:
         return False
 
-    distance = math.sqrt((station.pos[0]-base_station.pos[0])**2 + 
-                        (station.pos[1]-base_station.pos[1])**2)
+    if distance is None:
+        distance = station.distance_to(base_station.pos)
     distance_factor = max(0.4, 1 - (distance / DISTANCE_PENALTY))
     
     effective_reinforcements = min(MAX_MILITARY, 
@@ -87,4 +87,22 @@ def player_defend(station, reinforcements, base_station):
                                int(station.population * random.uniform(0.8, 0.9))))
 
     station.update_damage()
-    return True
\ No newline at end of file
+    return True
+
+def minor_alien_attack(station):
+    if station.population > 0 and station.alien_count > 0:
+        factor=random.uniform(0.1, 0.15)  # Light attack factor
+        lost = int(factor * station.population)
+        station.population -= lost
+
+        # Update damage % based on population lost
+        station.update_damage()
+        
+        damage = random.randint(1, 3)  # Very light damage
+        station.population = max(0, station.population - damage)
+        station.under_attack = True
+        station.original_population = station.population
+        # station.damage = damage
+        # station.update_damage()
+        return True
+    return False
\ No newline at end of file
@@ -1,161 +1,92 @@
 import pygame
 import pygame_gui
-import os
-import random
+import argparse
 import time
-import math
-from datetime import datetime
 from station import Station
 from ui import UIManager
-from game_logic import alien_attack, player_defend
-from ai import minimax, evaluate_station
+from ai import evaluate_station, weights_signature
+from assets import AssetManager
+from scenario import load_scenario
+from bases import ResourceBase, BaseNetwork, station_positions
+from camera import Camera, SpatialGrid
+from decision_cache import DecisionCache
+from session import GAME_DURATION, GameSession, plan_ai_turn, plan_player_turn, plan_wave_turn
+from telemetry import Telemetry
 pygame.init()
 
 WIDTH, HEIGHT = 1200, 700
 FPS = 60
-GAME_DURATION = 300
-MAX_AI_MEMORY = 3
+CAMERA_PAN_SPEED = 600  # Screen pixels per second
+LABEL_MARGIN = 40  # Room above a station for its name label
 
-#Fonst
 pygame.init()
-station_font = pygame.font.SysFont("arial", 28, bold=True) 
 window = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Alien Defense - Strategic Stations")
 
-layer_images = []
+assets = AssetManager()
 for i in range(1, 4):
-    path = os.path.join("assets", f"layer_{i}.png")
-    img = pygame.image.load(path).convert_alpha()
-    img = pygame.transform.scale(img, (WIDTH, HEIGHT))
-    layer_images.append(img)
-
-station_img = pygame.transform.scale(pygame.image.load("assets/station_1.png"), (150, 150))
-alien_img = pygame.transform.scale(pygame.image.load("assets/alien.png"), (35, 35))
-military_img = pygame.transform.scale(pygame.image.load("assets/military_yellow.png"), (50, 50))
-earth_base_img = pygame.transform.scale(pygame.image.load("assets/resource.png"), (200, 200))
-
-earth_base_pos = (WIDTH - 215, 20)
-earth_base = type('EarthBase', (), {'pos': earth_base_pos})()
+    assets.register(f"layer_{i}", f"layer_{i}.png", (WIDTH, HEIGHT))
+assets.register("station", "station_1.png", (150, 150))
+assets.register("alien", "alien.png", (35, 35))
+assets.register("military", "military_yellow.png", (50, 50))
+assets.register("earth_base", "resource.png", (200, 200))
+startup_reported = False
 
 ui = UIManager((WIDTH, HEIGHT))
+decision_cache = DecisionCache(namespace=weights_signature())
+telemetry = Telemetry().start()
+
+parser = argparse.ArgumentParser(description="Alien Defense - Strategic Stations")
+parser.add_argument("--scenario", help="scenario directory written by scenario.py")
+parser.add_argument("--wave", type=int, default=1, help="stations the aliens may attack per turn")
+args = parser.parse_args()
+
+if args.scenario:
+    scenario_header, stations = load_scenario(args.scenario)
+    bases = [ResourceBase(b['name'], tuple(b['pos']), b['troops']) for b in scenario_header['bases']]
+    network = BaseNetwork(bases, station_positions(stations))
+    stations.network = network
+    session = GameSession(0, stations, network, GAME_DURATION, telemetry)
+else:
+    session = GameSession.random(0, telemetry=telemetry, forbidden_zones=ui.get_forbidden_zones())
+    stations, network = session.stations, session.network
+earth_base = network.bases[0]
+
+world_size = (scenario_header['width'], scenario_header['height']) if args.scenario else (WIDTH, HEIGHT)
+camera = Camera((WIDTH, HEIGHT), world_size)
+station_grid = SpatialGrid(station_positions(stations))
 
-def generate_station_positions(count, margin=180, forbidden_zones=None):
-    if forbidden_zones is None:
-        forbidden_zones = [
-            pygame.Rect(20, 150, 180, 300), 
-            pygame.Rect(WIDTH - 215, 20, 200, 200)
-        ]
-
-    positions = []
-    max_attempts = 500
-
-    while len(positions) < count and max_attempts > 0:
-        x = random.randint(100, WIDTH - 200)
-        y = random.randint(50, HEIGHT - 200)
-        new_rect = pygame.Rect(x, y, 150, 150)
-
-        too_close = any(math.sqrt((x - px)**2 + (y - py)**2) < margin for px, py in positions) or \
-                    any(new_rect.colliderect(zone) for zone in forbidden_zones)
-
-        if not too_close:
-            positions.append((x, y))
-        max_attempts -= 1
-
-    return positions
-
-station_count = random.randint(6, 9)
-positions = generate_station_positions(
-    station_count,
-    margin=180,
-    forbidden_zones=ui.get_forbidden_zones()
-)
-
-stations = []
-
-for i, pos in enumerate(positions):
-    name = f"Station {chr(65 + i)}"
-    # When creating stations:
-    population = random.randint(200, 500)
-    military = random.randint(10, 50) if random.random() < 0.7 else random.randint(0, 10)
-    aliens = random.randint(50, 70) if random.random() < 0.7 else random.randint(0, 5) #Graeter cuz we are already sending troops too
-    stations.append(Station(name, pos, population, military, aliens))
-    stations[-1].update_damage()
-
-base_troops = 500
-
-game_start_time = datetime.now()
-game_over = False
-player_won = None
-last_ai_attacks = [] 
 clock = pygame.time.Clock()
 running = True
 
-turn = "ai"
-ai_attack_count = 0
 selected_station = None
 ai_delay_timer = 0
 last_ai_attack_station = None
-
-def check_game_over():
-    global game_over, player_won
-    
-    if all(s.population <= 0 for s in stations):
-        game_over = True
-        player_won = False
-        return True
-    
-    if all(s.alien_count <= 0 for s in stations):
-        game_over = True
-        player_won = True
-        return True
-    
-    if base_troops <= 0 and all(s.military_population <= 0 for s in stations):
-        game_over = True
-        player_won = False
-        return True
-    
-    time_elapsed = (datetime.now() - game_start_time).total_seconds()
-    if time_elapsed >= GAME_DURATION:
-        game_over = True
-        total_humans = sum(s.population for s in stations)
-        total_aliens = sum(s.alien_count for s in stations)
-        original_pop = sum(s.original_population for s in stations)
-    
-        player_won = (total_humans > total_aliens * 3) or (total_aliens == 0)
-        return True
-    
-    return False
+suggestion_version = None
+
+def show_station_info(station):
+    ui.update_info({
+        'name': station.name,
+        'under_attack': station.under_attack,
+        'population': station.population,
+        'military': station.military_population,
+        'aliens': station.alien_count,
+        'damage': station.damage,
+        'distance': station.distance_from_base
+    })
 
 def format_time(seconds):
     minutes = int(seconds // 60)
     seconds = int(seconds % 60)
     return f"{minutes:02d}:{seconds:02d}"
 
-def draw_station_connections():
-    for station in stations:
+def draw_station_connections(visible):
+    for station in visible:
         if station.alien_count > 0:
             pygame.draw.line(window, (255, 100, 100, 150), 
-                           (station.pos[0] + 75, station.pos[1] + 75),
-                           (earth_base_pos[0] + 100, earth_base_pos[1] + 100), 2)
+                           camera.world_to_screen(station.center),
+                           camera.world_to_screen(network.nearest_base(station).center), 2)
             
-def minor_alien_attack(station):
-    if station.population > 0 and station.alien_count > 0:
-        factor=random.uniform(0.1, 0.15)  # Light attack factor
-        lost = int(factor * station.population)
-        station.population -= lost
-
-        # Update damage % based on population lost
-        station.update_damage()
-        
-        damage = random.randint(1, 3)  # Very light damage
-        station.population = max(0, station.population - damage)
-        station.under_attack = True
-        station.original_population = station.population
-        # station.damage = damage
-        # station.update_damage()
-        return True
-    return False
-
 while running:
     dt = clock.tick(FPS) / 1000.0
 
@@ -165,51 +96,34 @@ while running:
 
         ui.process_events(event)
 
-        if event.type == pygame.MOUSEBUTTONDOWN and turn == "player" and not game_over:
-            mx, my = pygame.mouse.get_pos()
-            for station in stations:
-                x, y, w, h = station.get_rect()
-                if x <= mx <= x + w and y <= my <= y + h:
-                    selected_station = station
-                    ui.update_info({
-                        'name': selected_station.name,
-                        'under_attack': selected_station.under_attack,
-                        'population': selected_station.population,
-                        'military': selected_station.military_population,
-                        'aliens': selected_station.alien_count,
-                        'damage': selected_station.damage,
-                        'distance': selected_station.distance_from_base
-                    })
-                    break
-
-        if event.type == pygame_gui.UI_BUTTON_PRESSED and event.ui_element == ui.elements['send_button'] and turn == "player" and not game_over:
+        if event.type == pygame.MOUSEWHEEL:
+            camera.zoom_at(event.y, pygame.mouse.get_pos())
+
+        if event.type == pygame.MOUSEMOTION and event.buttons[2]:
+            camera.pan(-event.rel[0], -event.rel[1])
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and session.turn == "player" and not session.game_over:
+            clicked = station_grid.at_point(camera.screen_to_world(event.pos))
+            if clicked is not None:
+                selected_station = stations[clicked]
+                show_station_info(selected_station)
+
+        if event.type == pygame_gui.UI_BUTTON_PRESSED and event.ui_element == ui.elements['send_button'] and session.turn == "player" and not session.game_over:
             if selected_station:
                 try:
                     reinforcements = int(ui.elements['troop_input'].get_text())
-                    if reinforcements > base_troops:
-                        ui.update_status("Not enough troops at base.")
-                    elif reinforcements <= 0:
+                    supply_base = network.supplying_base(selected_station, reinforcements)
+                    if reinforcements <= 0:
                         ui.update_status("Enter a positive number of troops.")
+                    elif supply_base is None:
+                        ui.update_status("Not enough troops at base.")
                     else:
-                        if player_defend(selected_station, reinforcements, earth_base):
-                            base_troops -= reinforcements
-                            ui.update_info({
-                                'name': selected_station.name,
-                                'under_attack': selected_station.under_attack,
-                                'population': selected_station.population,
-                                'military': selected_station.military_population,
-                                'aliens': selected_station.alien_count,
-                                'damage': selected_station.damage,
-                                'distance': selected_station.distance_from_base
-                            })
-                            ui.update_status(f"Sent {reinforcements} troops to {selected_station.name}")
-                            station_center = (
-                                selected_station.pos[0] + Station.WIDTH//2,
-                                selected_station.pos[1] + Station.HEIGHT//2
-                            )
+                        if session.send_troops(selected_station.index, reinforcements) is None:
+                            show_station_info(selected_station)
+                            ui.update_status(f"Sent {reinforcements} troops from {supply_base.name} to {selected_station.name}")
+                            station_center = selected_station.center
                             ui.add_bomb_effect(station_center)
                             
-                            turn = "ai"
                             ai_delay_timer = time.time() + 1
                         # else:
                         #     ui.update_status("Defense failed - no aliens at station")
@@ -218,14 +132,17 @@ while running:
 
     ui.update(dt)
 
+    keys = pygame.key.get_pressed()
+    pan_x = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+    pan_y = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+    if pan_x or pan_y:
+        camera.pan(pan_x * CAMERA_PAN_SPEED * dt, pan_y * CAMERA_PAN_SPEED * dt)
 
     # Update timer
-    time_elapsed = (datetime.now() - game_start_time).total_seconds()
-    time_remaining = max(0, GAME_DURATION - time_elapsed)
-    ui.update_timer(int(time_remaining))
+    ui.update_timer(int(session.time_remaining()))
 
-    if not game_over and check_game_over():
-        if player_won:
+    if not session.game_over and session.check_game_over():
+        if session.player_won:
             ui.update_status("VICTORY! You successfully defended Earth!")
         else:
             ui.update_status("DEFEAT! The aliens have overrun our stations!")
@@ -331,131 +248,98 @@ while running:
 
     #     turn = "player"
     
-    if turn == "ai" and time.time() > ai_delay_timer and not game_over:
-            
-        if ai_attack_count == 0:
-            for s in stations:
-                if s.population > 0 and s.alien_count > 0:
-                    if minor_alien_attack(s):
-                        last_ai_attacks.append(s)
-                        if len(last_ai_attacks) > MAX_AI_MEMORY:
-                            last_ai_attacks.pop(0)
-                        
-                        ui.update_info({
-                            'name': s.name,
-                            'under_attack': s.under_attack,
-                            'population': s.population,
-                            'military': s.military_population,
-                            'aliens': s.alien_count,
-                            'damage': s.damage,
-                            'distance': s.distance_from_base
-                        })
-                        ui.update_status(f"AI lightly attacked {s.name} (initial wave)")
-
-                        station_center = (
-                            s.pos[0] + Station.WIDTH // 2,
-                            s.pos[1] + Station.HEIGHT // 2
-                        )
-                        ui.add_bomb_effect(station_center)
-            
-            ai_attack_count += 1
-            turn = "player"
-            
+    if session.turn == "ai" and time.time() > ai_delay_timer and not session.game_over:
+        opening = session.ai_attack_count == 0
+        job = session.ai_job()
+        if job is None:
+            targets = []
+        elif args.wave > 1:
+            targets = plan_wave_turn(*job, args.wave)
         else:
-            for s in stations:
-                s.under_attack = False
-
-            ai_station, _ = minimax(stations, 4, False, float('-inf'), float('inf'), earth_base, last_ai_attacks)
-
-            valid_targets = [s for s in stations if s.population > 0 and s.alien_count > 0]
-
-            if (not ai_station or
-                ai_station.population <= 0 or
-                ai_station.alien_count <= 0 or
-                ai_station not in valid_targets):
-
-                if len(valid_targets) == 1:
-                    ai_station = valid_targets[0]
-                elif len(valid_targets) > 1:
-                    ai_station = random.choice(valid_targets)
-                else:
-                    ai_station = None
-
-            if ai_station:
-                if alien_attack(ai_station):
-                    last_ai_attacks.append(ai_station)
-                    if len(last_ai_attacks) > MAX_AI_MEMORY:
-                        last_ai_attacks.pop(0)
-
-                    ui.update_info({
-                        'name': ai_station.name,
-                        'under_attack': ai_station.under_attack,
-                        'population': ai_station.population,
-                        'military': ai_station.military_population,
-                        'aliens': ai_station.alien_count,
-                        'damage': ai_station.damage,
-                        'distance': ai_station.distance_from_base
-                    })
-                    ui.update_status(f"AI attacked {ai_station.name}")
-                    last_ai_attack_station = ai_station
-
-                    station_center = (
-                        ai_station.pos[0] + Station.WIDTH // 2,
-                        ai_station.pos[1] + Station.HEIGHT // 2
-                    )
-                    ui.add_bomb_effect(station_center)
-                else:
-                    ui.update_status("AI attack failed")
+            target = plan_ai_turn(*job, cache=decision_cache)
+            targets = [target] if target is not None else []
+
+        attacked = session.apply_ai_turn(targets)
+        # Effects only for stations on screen, so the opening wave builds no off-screen rows
+        on_screen = set(station_grid.query(camera.visible_rect()))
+        for i in attacked:
+            if i in on_screen:
+                ui.add_bomb_effect(stations[i].center)
+
+        if attacked:
+            last_ai_attack_station = stations[attacked[-1]]
+            show_station_info(last_ai_attack_station)
+            if opening:
+                ui.update_status(f"AI lightly attacked {len(attacked)} stations (initial wave)")
             else:
-                ui.update_status("AI is regrouping forces")
+                ui.update_status(f"AI attacked {', '.join(stations[i].name for i in attacked)}")
+        elif not opening:
+            ui.update_status("AI is regrouping forces")
 
-            turn = "player"
 
+    ui.update_base_resources(network.total_troops())
 
-    ui.update_base_resources(base_troops)
+    # The suggestion only changes with the board, so search again only then
+    if session.version != suggestion_version:
+        suggestion_version = session.version
+        suggested_index = plan_player_turn(*session.search_args(is_player=True), cache=decision_cache)
+        if suggested_index is not None:
+            suggested_station = stations[suggested_index]
+            ui.update_ai_suggestion(suggested_station.name, evaluate_station(suggested_station, True, earth_base, session.last_attacks), suggested_station.alien_count)
 
-    suggested_station, _ = minimax(stations, 4, True, float('-inf'), float('inf'), earth_base, last_ai_attacks)
-    if suggested_station:
-        ui.update_ai_suggestion(suggested_station.name, evaluate_station(suggested_station, True, earth_base, last_ai_attacks), suggested_station.alien_count)
+    for i in range(1, 4):
+        window.blit(assets.get(f"layer_{i}"), (0, 0))
 
-    for layer in layer_images:
-        window.blit(layer, (0, 0))
+    zoom = camera.zoom
+    view = camera.visible_rect()
 
-    window.blit(earth_base_img, earth_base_pos)
+    base_img = assets.get_scaled("earth_base", zoom)
+    for base in network.bases:
+        if view.colliderect((*base.pos, 200, 200)):
+            window.blit(base_img, camera.world_to_screen(base.pos))
 
-    draw_station_connections()
+    # Only stations inside the viewport are drawn (and built, for scenario maps)
+    visible = [stations[i] for i in station_grid.query(view.inflate(0, LABEL_MARGIN * 2))]
 
-    for station in stations:
-        x, y = station.pos
+    draw_station_connections(visible)
+
+    station_img = assets.get_scaled("station", zoom)
+    alien_img = assets.get_scaled("alien", zoom)
+    military_img = assets.get_scaled("military", zoom)
+    station_font = assets.font("arial", camera.scale(28), bold=True) if zoom >= 0.5 else None
+    station_w = camera.scale(Station.WIDTH)
+    for station in visible:
+        x, y = camera.world_to_screen(station.pos)
         window.blit(station_img, (x, y))
         
-        name_surface = station_font.render(station.name, True, (255, 255, 255))
-        name_rect = name_surface.get_rect(center=(x + Station.WIDTH // 2, y - 20))
-        window.blit(name_surface, name_rect)
+        if station_font:
+            name_surface = station_font.render(station.name, True, (255, 255, 255))
+            name_rect = name_surface.get_rect(center=(x + station_w // 2, y - camera.scale(20)))
+            window.blit(name_surface, name_rect)
         
         if station == last_ai_attack_station:
-            pygame.draw.rect(window, (255, 0, 0, 150), (x, y, Station.WIDTH, 5))
+            pygame.draw.rect(window, (255, 0, 0, 150), (x, y, station_w, 5))
         
         if station.alien_count > 0:
-            window.blit(alien_img, (x + 30, y + 90))
+            window.blit(alien_img, (x + camera.scale(30), y + camera.scale(90)))
         if station.military_population > 0:
-            window.blit(military_img, (x + 70, y + 20))
+            window.blit(military_img, (x + camera.scale(70), y + camera.scale(20)))
         
         if station.damage > 0:
-            damage_width = int(Station.WIDTH * (station.damage / 100))
-            pygame.draw.rect(window, (255, 165, 0), (x, y + Station.HEIGHT - 10, damage_width, 5))
+            damage_width = int(station_w * (station.damage / 100))
+            pygame.draw.rect(window, (255, 165, 0), (x, y + camera.scale(Station.HEIGHT - 10), damage_width, 5))
         
         pygame.draw.line(window, (100, 100, 255, 50),
-                       (x + 75, y + 75),
-                       (earth_base_pos[0] + 100, earth_base_pos[1] + 100), 1)
+                       camera.world_to_screen(station.center),
+                       camera.world_to_screen(network.nearest_base(station).center), 1)
 
-    if game_over:
+    if session.game_over:
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         window.blit(overlay, (0, 0))
         
-        font = pygame.font.SysFont('Arial', 72)
-        if player_won:
+        font = assets.font('Arial', 72)
+        if session.player_won:
             text = font.render("VICTORY!", True, (0, 255, 0))
         else:
             text = font.render("DEFEAT", True, (255, 0, 0))
@@ -463,15 +347,21 @@ while running:
         text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2))
         window.blit(text, text_rect)
 
-        font_sm = pygame.font.SysFont('Arial', 24)
-        humans = sum(s.population for s in stations)
-        aliens = sum(s.alien_count for s in stations)
+        font_sm = assets.font('Arial', 24)
+        humans, aliens = session.totals()
         summary = font_sm.render(f"Humans: {humans} | Aliens: {aliens}", True, (255, 255, 255))
         window.blit(summary, (WIDTH//2 - 100, HEIGHT//2 + 50))
 
     ui.draw(window)
-    ui.draw_effects(window) 
+    ui.draw_effects(window, camera)
     pygame.display.flip()
 
+    if not startup_reported:
+        print(assets.startup_report())
+        startup_reported = True
+
+decision_cache.close()
+telemetry.close()
+print(telemetry.report())
 pygame.quit()
 print("Game closed.")
\ No newline at end of file
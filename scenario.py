@@ -0,0 +1,250 @@
+import os
+import json
+import argparse
+import numpy as np
+from typing import Dict, List, Optional
+from collections.abc import Sequence
+from station import Station, update_damage
+from bases import default_base_pos
+
+SCENARIO_VERSION = 1
+HEADER_FILE = "header.json"
+
+# Column name -> dtype. Every column is stored as its own .npy file so it
+# can be opened with mmap_mode. Names and positions stay mapped and are
+# paged in as stations are built; the numeric columns are copied into the
+# board's live state arrays at load, since every turn scans them whole.
+COLUMNS = {
+    'name': 'U16',
+    'pos': np.int32,
+    'population': np.int32,
+    'military': np.int32,
+    'aliens': np.int32,
+    'original_population': np.int32,
+}
+
+# Live state array -> Station attribute it mirrors
+STATION_FIELDS = {
+    'population': 'population',
+    'military': 'military_population',
+    'aliens': 'alien_count',
+    'original_population': 'original_population',
+    'damage': 'damage',
+    'under_attack': 'under_attack',
+}
+
+
+class ScenarioStations(Sequence):
+    """Station list backed by scenario columns.
+
+    The numeric columns are copied once into live state arrays (the
+    STATION_FIELDS keys, as attributes), and whole-board questions such as
+    totals, masks and vectorized attacks read those arrays directly. Station
+    objects are built the first time an index is accessed and kept, so game
+    code can mutate them like a normal list of stations. Call sync() after
+    changing a station so the arrays follow, and refresh() after changing
+    the arrays so built stations follow.
+
+    Stations measure from base_pos until a network is set, which points
+    them at their nearest base instead.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], base_pos):
+        self.columns = columns
+        self.base_pos = base_pos
+        self.network = None  # BaseNetwork that newly built stations attach to
+        self._rows: Dict[int, Station] = {}
+
+        self.population = np.array(columns['population'], dtype=np.int64)
+        self.military = np.array(columns['military'], dtype=np.int64)
+        self.aliens = np.array(columns['aliens'], dtype=np.int64)
+        self.original_population = np.array(columns['original_population'], dtype=np.int64)
+        self.damage = np.zeros_like(self.population)
+        self.under_attack = np.zeros(len(self.population), dtype=bool)
+        update_damage(self, True)
+
+    @classmethod
+    def from_stations(cls, stations: List[Station], base_pos) -> 'ScenarioStations':
+        """Board over already-built stations, whose index must match their position"""
+        board = cls(stations_to_columns(stations), base_pos)
+        for station in stations:
+            board._rows[station.index] = station
+            board.sync(station)
+        return board
+
+    def __len__(self):
+        return len(self.population)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("station index out of range")
+
+        station = self._rows.get(index)
+        if station is None:
+            station = self._build(index)
+            self._rows[index] = station
+        return station
+
+    def _build(self, index: int) -> Station:
+        cols = self.columns
+        x, y = cols['pos'][index]
+        station = Station(
+            str(cols['name'][index]),
+            (int(x), int(y)),
+            int(self.population[index]),
+            int(self.military[index]),
+            int(self.aliens[index]),
+            self.base_pos,
+            index=index
+        )
+        station.original_population = int(self.original_population[index])
+        station.damage = int(self.damage[index])
+        station.under_attack = bool(self.under_attack[index])
+        if self.network is not None:
+            self.network.attach(station)
+        return station
+
+    def sync(self, station: Station):
+        """Copy a built station's state into the arrays"""
+        for column, field in STATION_FIELDS.items():
+            getattr(self, column)[station.index] = getattr(station, field)
+
+    def refresh(self):
+        """Copy the arrays into every built station"""
+        for index, station in self._rows.items():
+            station.population = int(self.population[index])
+            station.military_population = int(self.military[index])
+            station.alien_count = int(self.aliens[index])
+            station.original_population = int(self.original_population[index])
+            station.damage = int(self.damage[index])
+            station.under_attack = bool(self.under_attack[index])
+
+    def materialized(self) -> List[Station]:
+        return [self._rows[i] for i in sorted(self._rows)]
+
+    def values(self, column: str) -> np.ndarray:
+        """Live state array for a column, e.g. 'population'"""
+        if column not in STATION_FIELDS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def name(self, index: int) -> str:
+        return str(self.columns['name'][index])
+
+
+def load_scenario(path: str, mmap: bool = True):
+    """Load a scenario directory. Returns (header, ScenarioStations)."""
+    with open(os.path.join(path, HEADER_FILE)) as f:
+        header = json.load(f)
+
+    if header.get('version') != SCENARIO_VERSION:
+        raise ValueError(f"Unsupported scenario version: {header.get('version')}")
+
+    mode = 'r' if mmap else None
+    columns = {}
+    for column in COLUMNS:
+        columns[column] = np.load(os.path.join(path, f"{column}.npy"), mmap_mode=mode)
+
+    if 'bases' not in header:
+        header['bases'] = [{'name': 'Earth', 'pos': list(default_base_pos(header['width'])),
+                            'troops': header['base_troops']}]
+
+    count = header['station_count']
+    for column, values in columns.items():
+        if len(values) != count:
+            raise ValueError(f"Column '{column}' has {len(values)} rows, expected {count}")
+
+    return header, ScenarioStations(columns, tuple(header['bases'][0]['pos']))
+
+
+def save_scenario(path: str, columns: Dict[str, np.ndarray], width: int, height: int,
+                  base_troops: int = 500, name: Optional[str] = None, bases: Optional[List[dict]] = None):
+    os.makedirs(path, exist_ok=True)
+    count = len(columns['population'])
+
+    for column, dtype in COLUMNS.items():
+        values = np.ascontiguousarray(columns[column], dtype=dtype)
+        np.save(os.path.join(path, f"{column}.npy"), values)
+
+    header = {
+        'version': SCENARIO_VERSION,
+        'name': name or os.path.basename(os.path.normpath(path)),
+        'station_count': count,
+        'width': width,
+        'height': height,
+        'base_troops': base_troops,
+        'bases': bases or [{'name': 'Earth', 'pos': list(default_base_pos(width)), 'troops': base_troops}],
+        'columns': list(COLUMNS),
+    }
+    with open(os.path.join(path, HEADER_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+
+
+def stations_to_columns(stations: List[Station]) -> Dict[str, np.ndarray]:
+    return {
+        'name': np.array([s.name for s in stations], dtype=COLUMNS['name']),
+        'pos': np.array([s.pos for s in stations], dtype=np.int32).reshape(-1, 2),
+        'population': np.array([s.population for s in stations], dtype=np.int32),
+        'military': np.array([s.military_population for s in stations], dtype=np.int32),
+        'aliens': np.array([s.alien_count for s in stations], dtype=np.int32),
+        'original_population': np.array([s.original_population for s in stations], dtype=np.int32),
+    }
+
+
+def generate_columns(count: int, spacing: int = 200, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Random map on a jittered grid, using the same ranges as main.py."""
+    rng = np.random.default_rng(seed)
+    per_row = max(1, int(np.ceil(np.sqrt(count))))
+
+    index = np.arange(count)
+    jitter = rng.integers(0, max(1, spacing - Station.WIDTH), size=(count, 2))
+    # Leave the top band of the map free for resource bases
+    pos = np.stack([index % per_row, index // per_row], axis=1) * spacing + (100, 260) + jitter
+
+    population = rng.integers(200, 501, size=count)
+    military = np.where(rng.random(count) < 0.7,
+                        rng.integers(10, 51, size=count),
+                        rng.integers(0, 11, size=count))
+    aliens = np.where(rng.random(count) < 0.7,
+                      rng.integers(50, 71, size=count),
+                      rng.integers(0, 6, size=count))
+
+    return {
+        'name': np.array([f"Station {i}" for i in range(count)], dtype=COLUMNS['name']),
+        'pos': pos.astype(np.int32),
+        'population': population.astype(np.int32),
+        'military': military.astype(np.int32),
+        'aliens': aliens.astype(np.int32),
+        'original_population': population.astype(np.int32),
+    }
+
+
+def generate_bases(count: int, width: int, height: int, troops: int) -> List[dict]:
+    """Spread bases evenly along the top edge of the map"""
+    step = width / count
+    return [
+        {'name': f"Base {i + 1}", 'pos': [int(step * i + step / 2) - 100, 20], 'troops': troops}
+        for i in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a fixed scenario directory")
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--spacing", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bases", type=int, default=1)
+    parser.add_argument("--troops", type=int, default=500, help="troops per base")
+    args = parser.parse_args()
+
+    cols = generate_columns(args.count, args.spacing, args.seed)
+    span = cols['pos'].max(axis=0) + Station.WIDTH + 100
+    base_list = generate_bases(args.bases, int(span[0]), int(span[1]), args.troops)
+    save_scenario(args.path, cols, int(span[0]), int(span[1]),
+                  base_troops=args.troops * args.bases, bases=base_list)
+    print(f"Wrote {args.count} stations to {args.path}")
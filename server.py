@@ -0,0 +1,225 @@
+import json
+import asyncio
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+from typing import Dict, Optional, Set
+from ai import weights_signature
+from decision_cache import CACHE_FILE, DecisionCache
+from session import STATION_KEYS, GameSession, plan_ai_turn, plan_player_turn, diff_rows
+from telemetry import Telemetry, TELEMETRY_DIR
+
+MAX_LINE = 64 * 1024
+
+# Each pool worker opens its own connection to the shared decision store
+_worker_cache: Optional[DecisionCache] = None
+
+
+def _init_worker(cache_path: str):
+    global _worker_cache
+    _worker_cache = DecisionCache(cache_path, namespace=weights_signature())
+    # Flush pending last-used updates when the pool shuts the worker down
+    Finalize(_worker_cache, _worker_cache.close, exitpriority=10)
+
+
+def _plan_ai_turn(*job):
+    return plan_ai_turn(*job, cache=_worker_cache)
+
+
+def _plan_player_turn(*job):
+    return plan_player_turn(*job, cache=_worker_cache)
+
+
+class Client:
+    """One connection; remembers the last station view sent for each session"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.views: Dict[int, list] = {}
+
+    async def send(self, message: dict):
+        self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b"\n")
+        await self.writer.drain()
+
+
+class GameServer:
+    """Hosts independent GameSessions over newline-delimited JSON.
+
+    Requests are single-line JSON objects with an "op" field:
+
+        {"op": "new", "seed": 7}                          -> full state
+        {"op": "join", "session": 1}                      -> full state
+        {"op": "send", "session": 1, "station": 2, "troops": 40}
+        {"op": "auto", "session": 1}                      -> bot plays the player's move
+        {"op": "state", "session": 1}                     -> diff since this client's last view
+        {"op": "close", "session": 1}
+        {"op": "stats"}                                   -> rolling telemetry aggregates
+
+    Every session's subscribers get a pushed {"event": "diff"} after each
+    move. Minimax runs in a process pool so the event loop stays responsive;
+    every worker reads and fills the DecisionCache at cache_path, which
+    main.py uses too.
+    """
+
+    def __init__(self, workers: Optional[int] = None, duration: Optional[float] = None,
+                 telemetry_dir: str = TELEMETRY_DIR, cache_path: str = CACHE_FILE):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path,))
+        self.duration = duration
+        self.telemetry = Telemetry(telemetry_dir).start()
+        self.sessions: Dict[int, GameSession] = {}
+        self.locks: Dict[int, asyncio.Lock] = {}
+        self.subscribers: Dict[int, Set[Client]] = {}
+        self.ids = itertools.count(1)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = Client(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The rest of the oversized line is still in flight, so
+                    # the stream cannot be resynchronised; drop the client
+                    await client.send({'ok': False, 'error': f"request longer than {MAX_LINE} bytes"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = await self.dispatch(client, request)
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {'ok': False, 'error': f"bad request: {e}"}
+                await client.send(reply)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for subscribers in self.subscribers.values():
+                subscribers.discard(client)
+            writer.close()
+
+    async def dispatch(self, client: Client, request: dict) -> dict:
+        op = request['op']
+        if op == 'new':
+            kwargs = {'duration': self.duration} if self.duration else {}
+            session = GameSession.random(next(self.ids), request.get('seed'), telemetry=self.telemetry, **kwargs)
+            self.sessions[session.session_id] = session
+            self.locks[session.session_id] = asyncio.Lock()
+            self.subscribers[session.session_id] = set()
+            await self.run_ai_turn(session)
+            return self.join(client, session)
+        if op == 'stats':
+            return {'ok': True, 'stats': self.telemetry.aggregates()}
+
+        session = self.sessions.get(int(request['session']))
+        if session is None:
+            return {'ok': False, 'error': "no such session"}
+
+        if op == 'join':
+            return self.join(client, session)
+        if op == 'state':
+            return {'ok': True, **self.diff_for(client, session)}
+        if op == 'close':
+            self.close(session.session_id)
+            return {'ok': True}
+        if op in ('send', 'auto'):
+            async with self.locks[session.session_id]:
+                if op == 'send':
+                    error = session.send_troops(int(request['station']), int(request['troops']))
+                else:
+                    error = await self.auto_move(session)
+                if error:
+                    return {'ok': False, 'error': error}
+                await self.broadcast(session, exclude=client)
+                await self.run_ai_turn(session)
+                await self.broadcast(session, exclude=client)
+            return {'ok': True, **self.diff_for(client, session)}
+
+        return {'ok': False, 'error': f"unknown op: {op}"}
+
+    def join(self, client: Client, session: GameSession) -> dict:
+        self.subscribers[session.session_id].add(client)
+        client.views[session.session_id] = session.station_rows()
+        return {'ok': True, 'state': session.snapshot()}
+
+    def diff_for(self, client: Client, session: GameSession) -> dict:
+        current = session.station_rows()
+        # A client that never joined gets every field, as if from an empty view
+        previous = client.views.get(session.session_id, [(None,) * len(STATION_KEYS)] * len(current))
+        client.views[session.session_id] = current
+        return {'session': session.session_id, 'diff': diff_rows(previous, current), **session.status()}
+
+    async def broadcast(self, session: GameSession, exclude: Optional[Client] = None):
+        for client in list(self.subscribers.get(session.session_id, ())):
+            if client is exclude:
+                continue
+            try:
+                await client.send({'event': 'diff', **self.diff_for(client, session)})
+            except ConnectionError:
+                self.subscribers[session.session_id].discard(client)
+
+    async def run_ai_turn(self, session: GameSession):
+        job = session.ai_job()
+        targets = []
+        if job is not None:
+            loop = asyncio.get_running_loop()
+            target = await loop.run_in_executor(self.pool, _plan_ai_turn, *job)
+            if target is not None:
+                targets.append(target)
+        session.apply_ai_turn(targets)
+
+    async def auto_move(self, session: GameSession) -> Optional[str]:
+        """Bot player: defend the station the AI suggests with a fixed share of troops"""
+        if session.turn != "player" or session.game_over:
+            return "not your turn"
+        loop = asyncio.get_running_loop()
+        target = await loop.run_in_executor(self.pool, _plan_player_turn, *session.search_args(is_player=True))
+        if target is None:
+            return "nothing to defend"
+        troops = max(1, min(50, session.network.total_troops()))
+        return session.send_troops(target, troops)
+
+    def close(self, session_id: int):
+        self.sessions.pop(session_id, None)
+        self.locks.pop(session_id, None)
+        self.subscribers.pop(session_id, None)
+        self.telemetry.end_session(session_id)
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.telemetry.close()
+
+
+async def serve(host: str, port: int, unix_path: Optional[str], workers: Optional[int],
+                duration: Optional[float] = None, telemetry_dir: str = TELEMETRY_DIR,
+                cache_path: str = CACHE_FILE):
+    server = GameServer(workers, duration, telemetry_dir, cache_path)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle, path=unix_path, limit=MAX_LINE)
+        print(f"Listening on {unix_path}")
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, limit=MAX_LINE)
+        print(f"Listening on {host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless multi-session game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on a Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="AI search processes")
+    parser.add_argument("--duration", type=float, default=None, help="seconds per match")
+    parser.add_argument("--telemetry", default=TELEMETRY_DIR, help="directory for turn event logs")
+    parser.add_argument("--cache", default=CACHE_FILE, help="SQLite decision cache shared with main.py")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.duration, args.telemetry,
+                          args.cache))
+    except KeyboardInterrupt:
+        pass
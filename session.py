@@ -0,0 +1,311 @@
+import math
+import time
+import random
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from station import Station
+from bases import MAP_SIZE, ResourceBase, BaseNetwork, default_base_pos, station_positions
+from game_logic import alien_attack
+from ai import MAX_AI_MEMORY, cached_minimax
+from waves import plan_wave
+from scenario import ScenarioStations
+from batch_sim import minor_alien_attack_batch, station_scores
+from telemetry import Telemetry, station_state, turn_event
+
+WIDTH, HEIGHT = MAP_SIZE
+GAME_DURATION = 300
+BASE_TROOPS = 500
+AI_DEPTH = 4
+SEARCH_CANDIDATES = 10  # Stations handed to a move search; random maps fit entirely
+
+# Compact per-station fields used in snapshots and diffs
+STATION_KEYS = ('p', 'm', 'a', 'd')
+
+
+def _overlaps(x: int, y: int, zone) -> bool:
+    zx, zy, zw, zh = zone
+    return x < zx + zw and x + Station.WIDTH > zx and y < zy + zh and y + Station.HEIGHT > zy
+
+
+def generate_stations(rng: random.Random, base_pos, forbidden_zones=()) -> List[Station]:
+    """Random opening: 6-9 stations at least 180px apart, clear of the base and forbidden_zones"""
+    count = rng.randint(6, 9)
+    positions = []
+    attempts = 500
+    zones = [(base_pos[0], base_pos[1], ResourceBase.WIDTH, ResourceBase.HEIGHT), *forbidden_zones]
+    while len(positions) < count and attempts > 0:
+        x = rng.randint(100, WIDTH - 200)
+        y = rng.randint(50, HEIGHT - 200)
+        clear = not any(_overlaps(x, y, zone) for zone in zones)
+        if clear and all(math.hypot(x - px, y - py) >= 180 for px, py in positions):
+            positions.append((x, y))
+        attempts -= 1
+
+    stations = []
+    for i, pos in enumerate(positions):
+        population = rng.randint(200, 500)
+        military = rng.randint(10, 50) if rng.random() < 0.7 else rng.randint(0, 10)
+        aliens = rng.randint(50, 70) if rng.random() < 0.7 else rng.randint(0, 5)
+        stations.append(Station(f"Station {chr(65 + i)}", pos, population, military, aliens, base_pos, index=i))
+        stations[-1].update_damage()
+    return stations
+
+
+def plan_ai_turn(stations: List[Station], base_pos, memory: List[int], depth: int = AI_DEPTH,
+                 cache=None) -> Optional[int]:
+    """Alien target for one turn, as a station index.
+
+    Safe to run in a worker process: it only takes and returns picklable
+    values and works on its own copy of the stations. cache is an optional
+    DecisionCache for in-process callers.
+    """
+    base = ResourceBase("base", base_pos, 0)
+    recent = [stations[i] for i in memory]
+    station, _ = cached_minimax(stations, depth, False, base, recent, cache)
+    return station.index if station is not None else None
+
+
+def plan_player_turn(stations: List[Station], base_pos, memory: List[int], depth: int = AI_DEPTH,
+                     cache=None) -> Optional[int]:
+    """Station a bot player should reinforce, as a station index (worker-process safe)"""
+    base = ResourceBase("base", base_pos, 0)
+    recent = [stations[i] for i in memory]
+    station, _ = cached_minimax(stations, depth, True, base, recent, cache)
+    valid = [s for s in stations if s.population > 0 and s.alien_count > 0]
+    if station not in valid:
+        station = valid[0] if valid else None
+    return station.index if station is not None else None
+
+
+def plan_wave_turn(stations: List[Station], base_pos, memory: List[int], max_targets: int) -> List[int]:
+    """Targets for a multi-station alien wave, as station indices (worker-process safe)"""
+    base = ResourceBase("base", base_pos, 0)
+    recent = [stations[i] for i in memory]
+    targets, _ = plan_wave(stations, base, max_targets, recent)
+    return [s.index for s in targets]
+
+
+class GameSession:
+    """One headless match: the state main.py keeps in module globals.
+
+    stations is a ScenarioStations board; whole-board checks and the opening
+    wave work on its arrays, so only stations that are looked at or attacked
+    get built.
+    """
+
+    def __init__(self, session_id: int, stations: ScenarioStations, network: BaseNetwork,
+                 duration: float = GAME_DURATION, telemetry: Optional[Telemetry] = None,
+                 seed: Optional[int] = None):
+        self.session_id = session_id
+        self.stations = stations
+        self.network = network
+        self.rng = np.random.default_rng(seed)
+        self.duration = duration
+        self.start_time = time.monotonic()
+        self.last_attacks: List[Station] = []
+        self.turn = "ai"
+        self.version = 0  # Bumped whenever the board changes
+        self.ai_attack_count = 0
+        self.game_over = False
+        self.player_won = None
+        self.telemetry = telemetry
+
+    @classmethod
+    def random(cls, session_id: int, seed: Optional[int] = None, duration: float = GAME_DURATION,
+               telemetry: Optional[Telemetry] = None, forbidden_zones=()):
+        base = ResourceBase("Earth", default_base_pos(WIDTH), BASE_TROOPS)
+        stations = generate_stations(random.Random(seed), base.pos, forbidden_zones)
+        network = BaseNetwork([base], station_positions(stations))
+        network.attach_all(stations)
+        board = ScenarioStations.from_stations(stations, base.pos)
+        board.network = network
+        return cls(session_id, board, network, duration, telemetry, seed)
+
+    def time_remaining(self) -> float:
+        return max(0.0, self.duration - (time.monotonic() - self.start_time))
+
+    def check_game_over(self) -> bool:
+        if self.game_over:
+            return True
+        board = self.stations
+        if not (board.population > 0).any():
+            self.player_won = False
+        elif not (board.aliens > 0).any():
+            self.player_won = True
+        elif self.network.total_troops() <= 0 and not (board.military > 0).any():
+            self.player_won = False
+        elif self.time_remaining() <= 0:
+            humans, aliens = self.totals()
+            self.player_won = (humans > aliens * 3) or (aliens == 0)
+        else:
+            return False
+        self.game_over = True
+        if self.telemetry is not None:
+            self.telemetry.end_session(self.session_id)
+        return True
+
+    def totals(self) -> Tuple[int, int]:
+        """Humans and aliens left across all stations"""
+        return int(self.stations.population.sum()), int(self.stations.aliens.sum())
+
+    def send_troops(self, index: int, troops: int) -> Optional[str]:
+        """Player move. Returns an error message, or None when troops were sent."""
+        if self.game_over:
+            return "game over"
+        if self.turn != "player":
+            return "not your turn"
+        if not 0 <= index < len(self.stations):
+            return "no such station"
+        if troops <= 0:
+            return "troops must be positive"
+
+        station = self.stations[index]
+        before = station_state(station)
+        if self.network.defend(station, troops) is None:
+            if self.network.supplying_base(station, troops) is None:
+                return "not enough troops at base"
+            return "no aliens at station"
+        self.stations.sync(station)
+        self._record('player', 'defend', index, before, troops)
+        self.version += 1
+
+        self.turn = "ai"
+        self.check_game_over()
+        return None
+
+    def search_candidates(self, is_player: bool, limit: int = SEARCH_CANDIDATES) -> List[int]:
+        """Station indices worth searching: the best contested ones by evaluate_station.
+
+        Boards no larger than limit are searched whole. Larger boards are
+        scored with one vectorized pass over the board arrays, so the search
+        cost does not grow with the station count.
+        """
+        board = self.stations
+        if len(board) <= limit:
+            return list(range(len(board)))
+
+        view = SimpleNamespace(
+            population=board.population, military=board.military, aliens=board.aliens,
+            damage=board.damage, distance=self.network.nearest_distance,
+            recent=np.array([s.index for s in self.last_attacks], dtype=np.int64),
+        )
+        contested = (board.population > 0) & (board.aliens > 0)
+        count = min(limit, int(contested.sum()))
+        if count == 0:
+            return []
+        scores = np.where(contested, station_scores(view, is_player), -np.inf)
+        return sorted(np.argpartition(-scores, count - 1)[:count].tolist())
+
+    def search_args(self, is_player: bool = False) -> Tuple[List[Station], Tuple[int, int], List[int]]:
+        """Picklable arguments for plan_ai_turn / plan_player_turn / plan_wave_turn.
+
+        The station list holds only the search candidates, and memory is
+        given as positions in that list.
+        """
+        candidates = [self.stations[i] for i in self.search_candidates(is_player)]
+        position = {s.index: i for i, s in enumerate(candidates)}
+        memory = [position[s.index] for s in self.last_attacks if s.index in position]
+        return candidates, self.network.bases[0].pos, memory
+
+    def ai_job(self) -> Optional[Tuple[List[Station], Tuple[int, int], List[int]]]:
+        """Arguments for plan_ai_turn, or None when this turn needs no search"""
+        if self.turn != "ai" or self.game_over or self.ai_attack_count == 0:
+            return None
+        return self.search_args()
+
+    def apply_ai_turn(self, targets: Sequence[int] = ()) -> List[int]:
+        """Resolve the alien turn, given the planned target indices.
+
+        Targets that cannot be attacked are skipped; if none is left, a random
+        contested station is hit instead. Returns attacked station indices.
+        """
+        if self.turn != "ai" or self.game_over:
+            return []
+
+        board = self.stations
+        board.under_attack = np.zeros(len(board), dtype=bool)
+        contested = (board.population > 0) & (board.aliens > 0)
+
+        attacked = []
+        if self.ai_attack_count == 0:
+            # Opening wave: a light hit on every contested station, on the arrays
+            before = board.population.copy(), board.damage.copy()
+            hit = minor_alien_attack_batch(board, self.rng)
+            board.under_attack = hit
+            board.refresh()
+            attacked = np.flatnonzero(hit).tolist()
+            for index in attacked[-MAX_AI_MEMORY:]:
+                self._remember(board[index])
+            if self.telemetry is not None:
+                for index in attacked:
+                    pre = (int(before[0][index]), int(board.military[index]),
+                           int(board.aliens[index]), int(before[1][index]))
+                    self._record('aliens', 'opening', index, pre)
+        else:
+            board.refresh()
+            chosen = [i for i in targets if 0 <= i < len(board) and contested[i]]
+            if not chosen:
+                valid = np.flatnonzero(contested)
+                chosen = [int(random.choice(valid))] if len(valid) else []
+            for index in chosen:
+                station = board[index]
+                before = station_state(station)
+                if alien_attack(station):
+                    board.sync(station)
+                    self._remember(station)
+                    self._record('aliens', 'attack', index, before)
+                    attacked.append(index)
+
+        self.ai_attack_count += 1
+        self.version += 1
+        self.turn = "player"
+        self.check_game_over()
+        return attacked
+
+    def _remember(self, station: Station):
+        self.last_attacks.append(station)
+        if len(self.last_attacks) > MAX_AI_MEMORY:
+            self.last_attacks.pop(0)
+
+    def _record(self, attacker: str, action: str, index: int, before, troops: int = 0):
+        if self.telemetry is not None:
+            self.telemetry.record(turn_event(attacker, action, self.stations.name(index), before,
+                                             self.station_rows(index), troops,
+                                             self.session_id, self.ai_attack_count))
+
+    def station_rows(self, index: Optional[int] = None):
+        """(population, military, aliens, damage) for every station, or for one index"""
+        board = self.stations
+        columns = (board.population, board.military, board.aliens, board.damage)
+        if index is not None:
+            return tuple(int(c[index]) for c in columns)
+        return list(zip(*(c.tolist() for c in columns)))
+
+    def status(self) -> Dict:
+        return {
+            'turn': self.turn,
+            'troops': self.network.total_troops(),
+            'time': int(self.time_remaining()),
+            'over': self.game_over,
+            'won': self.player_won,
+        }
+
+    def snapshot(self) -> Dict:
+        state = self.status()
+        state['session'] = self.session_id
+        names, positions = self.stations.columns['name'], self.stations.columns['pos'].tolist()
+        state['stations'] = [
+            {'n': str(name), 'x': x, 'y': y, **dict(zip(STATION_KEYS, row))}
+            for name, (x, y), row in zip(names, positions, self.station_rows())
+        ]
+        return state
+
+
+def diff_rows(previous, current) -> Dict[str, Dict[str, int]]:
+    """Changed station fields, keyed by station index, between two station_rows() views"""
+    changes = {}
+    for index, (old, new) in enumerate(zip(previous, current)):
+        if old != new:
+            changes[str(index)] = {k: v for k, o, v in zip(STATION_KEYS, old, new) if o != v}
+    return changes
@@ -1,11 +1,18 @@
 import math
 import pygame
+import numpy as np
 
 class Station:
     WIDTH = 150
     HEIGHT = 150
 
-    def __init__(self, name, pos, population, military_population, alien_count):
+    __slots__ = (
+        'name', 'pos', 'original_population', 'population', 'military_population',
+        'alien_count', 'damage', 'under_attack',
+        'center', 'rect', 'base_pos', 'distance_from_base', 'index'
+    )
+
+    def __init__(self, name, pos, population, military_population, alien_count, base_pos, index=None):
         self.name = name
         self.pos = pos
         self.original_population = population
@@ -14,17 +21,34 @@ class Station:
         self.alien_count = alien_count
         self.damage = 0
         self.under_attack = False
-        self.distance_from_base = int(math.sqrt((pos[0] - 1000)**2 + (pos[1] - 100)**2))  # Distance from resource base
+        self.index = index  # Row in the map's station arrays
+
+        # Stations never move, so geometry is computed once here
+        self.center = (pos[0] + Station.WIDTH // 2, pos[1] + Station.HEIGHT // 2)
+        self.rect = (pos[0], pos[1], Station.WIDTH, Station.HEIGHT)
+        self.set_base(base_pos)
+
+    def set_base(self, base_pos, distance=None):
+        """Attach the station to a resource base, caching the distance to it"""
+        self.base_pos = base_pos
+        if distance is None:
+            distance = math.hypot(self.pos[0] - base_pos[0], self.pos[1] - base_pos[1])
+        self.distance_from_base = distance
+
+    def distance_to(self, base_pos):
+        if base_pos == self.base_pos:
+            return self.distance_from_base
+        return math.hypot(self.pos[0] - base_pos[0], self.pos[1] - base_pos[1])
 
     def draw(self, surface):
-        pygame.draw.rect(surface, (100, 100, 255), (*self.pos, Station.WIDTH, Station.HEIGHT))
+        pygame.draw.rect(surface, (100, 100, 255), self.rect)
 
         name_surface = Station.font.render(self.name, True, (255, 255, 255))
-        name_rect = name_surface.get_rect(center=(self.pos[0] + Station.WIDTH // 2, self.pos[1] - 20))
+        name_rect = name_surface.get_rect(center=(self.center[0], self.pos[1] - 20))
         surface.blit(name_surface, name_rect)
 
     def get_rect(self):
-        return (*self.pos, self.WIDTH, self.HEIGHT)
+        return self.rect
 
     def get_info_html(self):
         return f"""<b>{self.name}</b><br>
@@ -41,3 +65,16 @@ Distance: {int(self.distance_from_base)}px"""
         else:
             pop_lost = self.original_population - self.population
             self.damage = min(100, int((pop_lost / self.original_population) * 100))
+
+
+def update_damage(state, mask):
+    """Station.update_damage for every station in the arrays where mask is set.
+
+    state is anything with population / original_population / damage
+    arrays, such as a batch of games or one scenario board.
+    """
+    orig = state.original_population
+    safe = np.where(orig == 0, 1, orig)
+    damage = np.minimum(100, np.trunc(((orig - state.population) / safe) * 100)).astype(np.int64)
+    damage = np.where(orig == 0, 0, damage)
+    state.damage = np.where(mask, damage, state.damage)
@@ -0,0 +1,195 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+from station import Station
+
+TELEMETRY_DIR = "telemetry"
+BUFFER_SIZE = 8192
+BATCH_SIZE = 512
+FLUSH_INTERVAL = 1.0
+MAX_FILE_BYTES = 4 * 1024 * 1024
+MAX_FILES = 10
+WINDOW = 100  # Turns covered by the rolling aggregates
+TURN_FIELDS = ('casualties', 'alien_losses', 'troops', 'attacks', 'successes')
+
+
+def station_state(station: Station) -> Tuple[int, int, int, int]:
+    return (station.population, station.military_population, station.alien_count, station.damage)
+
+
+def turn_event(attacker: str, action: str, target: str, before: Tuple[int, int, int, int],
+               after: Tuple[int, int, int, int], troops: int = 0, session=None,
+               turn: Optional[int] = None) -> Dict:
+    """One move record: who did what ('opening', 'attack' or 'defend') to which station"""
+    return {
+        'ts': time.time(),
+        'session': session,
+        'turn': turn,
+        'attacker': attacker,
+        'action': action,
+        'target': target,
+        'pre': dict(zip(('population', 'military', 'aliens', 'damage'), before)),
+        'post': dict(zip(('population', 'military', 'aliens', 'damage'), after)),
+        'troops': troops,
+    }
+
+
+class Telemetry:
+    """Bounded in-memory event ring with a background JSONL writer.
+
+    record() only appends to a deque and updates the rolling aggregates, so
+    it never blocks on disk. When the ring is full the oldest unwritten
+    events are dropped and counted. A daemon thread drains the ring in
+    batches to telemetry-<n>.jsonl files, starting a new file past
+    max_file_bytes and deleting the oldest beyond max_files.
+
+    The aggregates are per turn: events are summed per (session, turn), and
+    a turn enters the rolling windows once its session moves on to the next
+    turn or ends. The AI success rate only counts full alien attacks, not
+    the opening wave.
+    """
+
+    def __init__(self, directory: str = TELEMETRY_DIR, buffer_size: int = BUFFER_SIZE,
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 max_file_bytes: int = MAX_FILE_BYTES, max_files: int = MAX_FILES,
+                 window: int = WINDOW):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+
+        self.ring = deque(maxlen=buffer_size)
+        self.recorded = 0
+        self.written = 0
+
+        self.turns = deque(maxlen=window)  # Closed turn totals, as TURN_FIELDS tuples
+        self.open_turns: Dict = {}  # session -> (turn, totals being summed)
+        self.turns_closed = 0
+
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.file = None
+        self.file_index = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.recorded - self.written - len(self.ring)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self.thread.start()
+        return self
+
+    def record(self, event: Dict):
+        self.ring.append(event)
+        self.recorded += 1
+
+        session = event['session']
+        current = self.open_turns.get(session)
+        if current is not None and current[0] != event['turn']:
+            self.end_session(session)
+            current = None
+        if current is None:
+            current = self.open_turns[session] = (event['turn'], dict.fromkeys(TURN_FIELDS, 0))
+
+        totals = current[1]
+        pre, post = event['pre'], event['post']
+        totals['casualties'] += max(0, pre['population'] - post['population'])
+        totals['alien_losses'] += max(0, pre['aliens'] - post['aliens'])
+        totals['troops'] += event['troops']
+        if event['action'] == 'attack':
+            # The aliens came out ahead if they are still holding the station
+            totals['attacks'] += 1
+            totals['successes'] += post['aliens'] > 0
+
+        if len(self.ring) >= self.batch_size:
+            self.wake.set()
+
+    def end_session(self, session):
+        """Close the session's open turn, moving its totals into the windows"""
+        current = self.open_turns.pop(session, None)
+        if current is not None:
+            self.turns.append(tuple(current[1][field] for field in TURN_FIELDS))
+            self.turns_closed += 1
+
+    def aggregates(self) -> Dict[str, float]:
+        """Means over the last window turns, counting turns still in progress"""
+        turns = list(self.turns)
+        turns += [tuple(totals[field] for field in TURN_FIELDS) for _, totals in self.open_turns.values()]
+        sums = dict(zip(TURN_FIELDS, map(sum, zip(*turns)))) if turns else dict.fromkeys(TURN_FIELDS, 0)
+        count = len(turns) or 1
+
+        return {
+            'events': self.recorded,
+            'dropped': self.dropped,
+            'turns': self.turns_closed + len(self.open_turns),
+            'casualties_per_turn': sums['casualties'] / count,
+            'alien_losses_per_turn': sums['alien_losses'] / count,
+            'troops_per_turn': sums['troops'] / count,
+            'ai_success_rate': sums['successes'] / sums['attacks'] if sums['attacks'] else 0.0,
+        }
+
+    def report(self) -> str:
+        lines = []
+        for key, value in self.aggregates().items():
+            lines.append(f"{key:<24} {value:9.2f}" if isinstance(value, float) else f"{key:<24} {value:9d}")
+        return "\n".join(lines)
+
+    def close(self):
+        self.stopping = True
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        else:
+            self._drain()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _run(self):
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        while self.ring:
+            batch = []
+            while self.ring and len(batch) < self.batch_size:
+                batch.append(self.ring.popleft())
+            try:
+                self._write(batch)
+            except OSError:
+                return
+            self.written += len(batch)
+
+    def _write(self, batch):
+        if self.file is None or self.file.tell() >= self.max_file_bytes:
+            self._rotate()
+        self.file.write("".join(json.dumps(event, separators=(',', ':')) + "\n" for event in batch))
+        self.file.flush()
+
+    def _rotate(self):
+        if self.file is not None:
+            self.file.close()
+        os.makedirs(self.directory, exist_ok=True)
+
+        existing = sorted(
+            (int(name[len("telemetry-"):-len(".jsonl")]), name)
+            for name in os.listdir(self.directory)
+            if name.startswith("telemetry-") and name.endswith(".jsonl")
+        )
+        self.file_index = existing[-1][0] + 1 if existing else 0
+        for _, name in existing[:max(0, len(existing) - self.max_files + 1)]:
+            os.remove(os.path.join(self.directory, name))
+
+        path = os.path.join(self.directory, f"telemetry-{self.file_index:05d}.jsonl")
+        self.file = open(path, "a")
@@ -0,0 +1,12 @@
+import pytest
+from batch_sim import MAX_GAP, consistency_check
+
+
+@pytest.fixture(scope="module")
+def gaps():
+    return consistency_check(seed=0)
+
+
+@pytest.mark.parametrize("name", ['minor_alien_attack', 'alien_attack', 'player_defend'])
+def test_batch_matches_game_logic(gaps, name):
+    assert gaps[name] <= MAX_GAP, f"{name} differs from game_logic by {gaps[name]:.2f} standard errors"
@@ -0,0 +1,237 @@
+import os
+import json
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import ai
+from ai import DEFAULT_WEIGHTS, WEIGHTS_FILE
+from batch_sim import BatchState, BatchSimulator
+
+CHECKPOINT_FILE = "tuning_checkpoint.json"
+FITNESS_MODEL = "contested-paired-v1"  # Checkpoints scored under another model cannot be resumed
+
+# Main.py's openings are won by the humans in practically every simulated
+# game within a few moves, which leaves nothing for the weights to change.
+# Tuning games get four times the aliens (capped at MAX_ALIENS) and a base
+# of 100 troops sent 10 at a time: the player makes about ten choices per
+# game and the default weights lose roughly one game in eight.
+CONTESTED_ALIEN_SCALE = 4.0
+CONTESTED_BASE_TROOPS = 100
+CONTESTED_REINFORCEMENTS = 10
+
+TRAIN_STREAM, HOLDOUT_STREAM = 0, 1  # Seed streams for training and held-out games
+HOLDOUT_BATCHES = 8
+MIN_Z = 3.0  # Standard errors by which tuned weights must beat DEFAULT_WEIGHTS to be written
+
+# The *_population_scale divisors are left out because they only rescale the
+# matching *_population coefficient, and distance_scale because it is shared
+# by both sides; the per-side *_distance coefficients cover it.
+SIDE_KEYS = {
+    'player': ['player_population', 'player_aliens', 'player_damage', 'player_military',
+               'player_distance', 'player_recent'],
+    'alien': ['alien_population', 'alien_military', 'alien_aliens', 'alien_damage',
+              'alien_distance', 'alien_recent'],
+}
+
+
+def game_scores(side: str, weights: Dict[str, float], opponent: Dict[str, float],
+                games: int, stations: int, seed) -> np.ndarray:
+    """Score one weight set on each game of a seeded batch of contested games.
+
+    The tuned side plays with ``weights`` and the other side with
+    ``opponent``, both through batch_sim's greedy one-ply policy, so the
+    result only approximates how the weights do under main.py's depth-4
+    minimax. A game scores 1 for a win plus half the surviving population
+    fraction (for the alien side, half the fraction it killed).
+
+    The same seed gives the same openings and random stream, so two weight
+    sets scored on one seed can be compared game by game.
+    """
+    state = BatchState.random(games, stations, np.random.default_rng(seed),
+                              base_troops=CONTESTED_BASE_TROOPS, alien_scale=CONTESTED_ALIEN_SCALE)
+    if side == 'player':
+        sim = BatchSimulator(state, seed, CONTESTED_REINFORCEMENTS, player_weights=weights, alien_weights=opponent)
+    else:
+        sim = BatchSimulator(state, seed, CONTESTED_REINFORCEMENTS, player_weights=opponent, alien_weights=weights)
+    final = sim.run()
+
+    survivors = final.population.sum(axis=1) / np.maximum(1, final.original_population.sum(axis=1))
+    if side == 'player':
+        return final.human_won + 0.5 * survivors
+    return ~final.human_won + 0.5 * (1 - survivors)
+
+
+def fitness(side: str, weights: Dict[str, float], opponent: Dict[str, float],
+            games: int, stations: int, seed) -> float:
+    """Mean game_scores over the batch"""
+    return float(game_scores(side, weights, opponent, games, stations, seed).mean())
+
+
+def _evaluate(job):
+    return game_scores(*job)
+
+
+class CrossEntropyTuner:
+    """Cross-entropy method over the evaluate_station weights of one side.
+
+    Each generation samples candidates from a diagonal Gaussian, scores them
+    in a process pool on the same seeded games, and refits the Gaussian to
+    the elite fraction. A candidate's fitness is its mean per-game advantage
+    over the DEFAULT_WEIGHTS baseline on those games, so fitness values from
+    different generations are comparable. The opponent plays with the
+    weights ai.py loaded at startup. State is checkpointed after every
+    generation.
+    """
+
+    def __init__(self, side: str = 'player', population: int = 32, elite_frac: float = 0.25,
+                 games: int = 512, stations: int = 8, seed: int = 0,
+                 checkpoint: str = CHECKPOINT_FILE, workers: Optional[int] = None):
+        if side not in SIDE_KEYS:
+            raise ValueError(f"Unknown side: {side}")
+        self.side = side
+        self.keys = SIDE_KEYS[side]
+        self.population = population
+        self.elite = max(2, int(population * elite_frac))
+        self.games = games
+        self.stations = stations
+        self.seed = seed
+        self.checkpoint = checkpoint
+        self.workers = workers
+
+        start = np.array([ai.weights[k] for k in self.keys], dtype=np.float64)
+        self.mean = start
+        self.std = np.abs(start) * 0.3 + 0.1
+        self.generation = 0
+        self.best_vector = start.copy()
+        self.best_fitness = float('-inf')
+        self.baseline = self.weights_for([DEFAULT_WEIGHTS[k] for k in self.keys])
+
+    def weights_for(self, vector) -> Dict[str, float]:
+        weights = dict(ai.weights)
+        weights.update({k: float(v) for k, v in zip(self.keys, vector)})
+        return weights
+
+    def sample(self) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, self.generation])
+        candidates = rng.normal(self.mean, self.std, size=(self.population, len(self.keys)))
+        candidates[0] = self.mean  # Always re-score the current mean
+        # Every tuned term already carries its sign in evaluate_station
+        return np.maximum(candidates, 0)
+
+    def step(self, pool: ProcessPoolExecutor) -> float:
+        candidates = self.sample()
+        game_seed = [self.seed, TRAIN_STREAM, self.generation]
+        opponent = dict(ai.weights)
+        jobs = [(self.side, self.weights_for(c), opponent, self.games, self.stations, game_seed)
+                for c in candidates]
+        jobs.append((self.side, self.baseline, opponent, self.games, self.stations, game_seed))
+        *results, baseline = pool.map(_evaluate, jobs)
+        scores = np.array([(result - baseline).mean() for result in results])
+
+        order = np.argsort(scores)[::-1]
+        elite = candidates[order[:self.elite]]
+        self.mean = 0.7 * elite.mean(axis=0) + 0.3 * self.mean
+        self.std = 0.7 * elite.std(axis=0) + 0.3 * self.std + 1e-3
+
+        if scores[order[0]] > self.best_fitness:
+            self.best_fitness = float(scores[order[0]])
+            self.best_vector = candidates[order[0]].copy()
+
+        self.generation += 1
+        self.save_checkpoint()
+        return float(scores[order[0]])
+
+    def run(self, generations: int, verbose: bool = True) -> Dict[str, float]:
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while self.generation < generations:
+                best = self.step(pool)
+                if verbose:
+                    print(f"gen {self.generation:3d}  best {best:+.4f}  overall {self.best_fitness:+.4f}")
+        return self.weights_for(self.best_vector)
+
+    def validate(self, weights: Dict[str, float], batches: int = HOLDOUT_BATCHES) -> Tuple[float, float]:
+        """Mean per-game advantage of weights over DEFAULT_WEIGHTS on held-out seeds, with its standard error"""
+        opponent = dict(ai.weights)
+        jobs = []
+        for batch in range(batches):
+            game_seed = [self.seed, HOLDOUT_STREAM, batch]
+            jobs.append((self.side, weights, opponent, self.games, self.stations, game_seed))
+            jobs.append((self.side, self.baseline, opponent, self.games, self.stations, game_seed))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(_evaluate, jobs))
+
+        diffs = np.concatenate([tuned - base for tuned, base in zip(results[::2], results[1::2])])
+        return float(diffs.mean()), float(diffs.std(ddof=1) / np.sqrt(len(diffs)))
+
+    def save_checkpoint(self):
+        data = {
+            'fitness': FITNESS_MODEL,
+            'side': self.side,
+            'keys': self.keys,
+            'seed': self.seed,
+            'generation': self.generation,
+            'mean': self.mean.tolist(),
+            'std': self.std.tolist(),
+            'best_vector': self.best_vector.tolist(),
+            'best_fitness': self.best_fitness,
+        }
+        tmp_path = self.checkpoint + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.checkpoint)
+
+    def load_checkpoint(self) -> bool:
+        if not os.path.exists(self.checkpoint):
+            return False
+        with open(self.checkpoint) as f:
+            data = json.load(f)
+        if data.get('fitness') != FITNESS_MODEL or data['side'] != self.side or data['keys'] != self.keys:
+            raise ValueError(f"Checkpoint {self.checkpoint} was written for a different parameter set")
+        self.seed = data['seed']
+        self.generation = data['generation']
+        self.mean = np.array(data['mean'])
+        self.std = np.array(data['std'])
+        self.best_vector = np.array(data['best_vector'])
+        self.best_fitness = data['best_fitness']
+        return True
+
+
+def save_weights(weights: Dict[str, float], keys: List[str], path: str = WEIGHTS_FILE):
+    """Merge the tuned keys into the weights file that ai.py loads at startup"""
+    stored = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+    stored.update({k: weights[k] for k in keys})
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune evaluate_station weights with the cross-entropy method")
+    parser.add_argument("--side", choices=sorted(SIDE_KEYS), default="player")
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--population", type=int, default=32)
+    parser.add_argument("--games", type=int, default=512)
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--output", default=WEIGHTS_FILE)
+    parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    tuner = CrossEntropyTuner(args.side, args.population, games=args.games, stations=args.stations,
+                              seed=args.seed, checkpoint=args.checkpoint, workers=args.workers)
+    if not args.fresh and tuner.load_checkpoint():
+        print(f"Resuming from generation {tuner.generation}")
+
+    best = tuner.run(args.generations)
+    advantage, std_error = tuner.validate(best)
+    print(f"Held-out advantage over DEFAULT_WEIGHTS: {advantage:+.4f} +/- {std_error:.4f}")
+    if advantage > MIN_Z * std_error:
+        save_weights(best, tuner.keys, args.output)
+        print(f"Wrote best weights to {args.output}")
+    else:
+        print(f"Not significant at {MIN_Z} standard errors; {args.output} left unchanged")
@@ -70,7 +70,7 @@ class UIManager:
 <b>Military:</b> {station_data['military']}
 <b>Aliens:</b> {station_data['aliens']}
 <b>Damage:</b> {station_data['damage']}%
-<b>Distance:</b> {station_data['distance']}px
+<b>Distance:</b> {int(station_data['distance'])}px
         """
         self.elements['info_panel'].set_text(html)
 
@@ -131,19 +131,25 @@ class UIManager:
         self.bomb_effects.append(bomb_effect)
 
 
-    def draw_effects(self, surface):
+    def draw_effects(self, surface, camera=None):
+        """Draw effects; positions are in world space when a camera is given"""
+        zoom = camera.zoom if camera else 1.0
+        bounds = surface.get_rect()
+
         if hasattr(self, 'click_effects'):
             for effect in self.click_effects[:]:
                 progress = effect['time'] / effect['max_time']
-                radius = int(30 * (1 - progress))
+                radius = int(30 * (1 - progress) * zoom)
                 alpha = int(200 * (1 - progress))
-                
-                s = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-                pygame.draw.circle(s, (255, 255, 0, alpha), (radius, radius), radius)
-                surface.blit(s, (
-                    effect['position'][0] - radius,
-                    effect['position'][1] - radius
-                ))
+                center = camera.world_to_screen(effect['position']) if camera else effect['position']
+
+                if radius > 0 and bounds.colliderect((center[0] - radius, center[1] - radius, radius*2, radius*2)):
+                    s = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+                    pygame.draw.circle(s, (255, 255, 0, alpha), (radius, radius), radius)
+                    surface.blit(s, (
+                        center[0] - radius,
+                        center[1] - radius
+                    ))
                 
                 effect['time'] += 0.016
                 if effect['time'] >= effect['max_time']:
@@ -152,24 +158,27 @@ class UIManager:
         if hasattr(self, 'bomb_effects'):
             for effect in self.bomb_effects[:]:
                 effect['time'] += 0.016 
+                center = camera.world_to_screen(effect['position']) if camera else effect['position']
+                reach = int(90 * zoom)
                 
-                for pulse in effect['pulses']:
-                    if effect['time'] >= pulse['delay']:
-                        pulse_progress = min(1.0, (effect['time'] - pulse['delay']) / 0.4)
-                        radius = int(pulse['radius'] * (1 + pulse_progress * 2))
-                        alpha = int(pulse['alpha'] * (1 - pulse_progress))
-                        
-                        s = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-                        pygame.draw.circle(
-                            s, 
-                            (*pulse['color'], alpha), 
-                            (radius, radius), 
-                            radius
-                        )
-                        surface.blit(s, (
-                            effect['position'][0] - radius,
-                            effect['position'][1] - radius
-                        ))
+                if bounds.colliderect((center[0] - reach, center[1] - reach, reach*2, reach*2)):
+                    for pulse in effect['pulses']:
+                        if effect['time'] >= pulse['delay']:
+                            pulse_progress = min(1.0, (effect['time'] - pulse['delay']) / 0.4)
+                            radius = max(1, int(pulse['radius'] * (1 + pulse_progress * 2) * zoom))
+                            alpha = int(pulse['alpha'] * (1 - pulse_progress))
+                            
+                            s = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+                            pygame.draw.circle(
+                                s, 
+                                (*pulse['color'], alpha), 
+                                (radius, radius), 
+                                radius
+                            )
+                            surface.blit(s, (
+                                center[0] - radius,
+                                center[1] - radius
+                            ))
                 
                 if effect['time'] >= effect['max_time']:
                     self.bomb_effects.remove(effect)
\ No newline at end of file
@@ -0,0 +1,55 @@
+from typing import List, Tuple
+from station import Station
+from ai import evaluate_station
+
+BEAM_WIDTH = 8
+WAVE_FORCE_SHARE = 0.6  # Share of all live aliens one wave may commit
+
+
+def wave_candidates(stations: List[Station]) -> List[Station]:
+    return [s for s in stations if s.population > 0 and s.alien_count > 0]
+
+
+def plan_wave(stations: List[Station], base_station, max_targets: int,
+              memory_attacks=None, beam_width: int = BEAM_WIDTH,
+              force_share: float = WAVE_FORCE_SHARE) -> Tuple[List[Station], float]:
+    """Pick up to max_targets stations for one alien wave with beam search.
+
+    Each target commits the aliens stationed there, and a wave may only
+    commit force_share of all live aliens, so choosing targets is a small
+    knapsack. Partial plans are extended one target at a time (in candidate
+    order, so each subset is built once) and scored incrementally by adding
+    the target's evaluate_station score. Only the best beam_width partial
+    plans survive each round, which bounds the work to
+    max_targets * beam_width * len(candidates) score additions.
+
+    Returns (targets, score); targets is empty when nothing can be attacked.
+    """
+    candidates = wave_candidates(stations)
+    if not candidates:
+        return [], 0
+
+    scores = [evaluate_station(s, False, base_station, memory_attacks) for s in candidates]
+    total_force = sum(s.alien_count for s in candidates)
+    budget = max(max(s.alien_count for s in candidates), int(total_force * force_share))
+
+    # Beam entries: (score, force used, index of last target, target indices)
+    beam = [(0.0, 0, -1, ())]
+    best = beam[0]
+    for _ in range(max_targets):
+        expanded = []
+        for score, force, last, plan in beam:
+            for i in range(last + 1, len(candidates)):
+                needed = force + candidates[i].alien_count
+                if needed <= budget:
+                    expanded.append((score + scores[i], needed, i, plan + (i,)))
+        if not expanded:
+            break
+
+        expanded.sort(key=lambda entry: (entry[0], -entry[1]), reverse=True)
+        beam = expanded[:beam_width]
+        if beam[0][0] > best[0]:
+            best = beam[0]
+
+    return [candidates[i] for i in best[3]], best[0]
+